@@ -0,0 +1,418 @@
+"""
+Batch Compiler
+Generates and compiles many resumes in parallel and streams the results
+back as a ZIP archive while items finish.
+
+Items run on a process pool sized to the machine's cores. Each worker
+process reuses its own workspaces and compiles from the precompiled
+formats the server dumped, so a long batch pays process startup only
+once per core. Workers keep no pdflatex processes pre-started.
+
+Every item (or single-run chunk) takes a slot from the server's compile
+scheduler before it is handed to the pool, so batches share the global
+pdflatex limit with interactive compiles and yield to them. Items of all
+running batches together are capped; a batch that would exceed the cap
+is rejected up front.
+
+In single-run mode, resumes that share a preamble are concatenated into
+one document, compiled with a single pdflatex run and split back into
+per-resume PDFs at the page boundaries recorded in the log.
+"""
+
+import asyncio
+import io
+import json
+import multiprocessing
+import re
+import subprocess
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend import latex_compiler, latex_log
+from backend.bounded_scheduler import BoundedScheduler
+from backend.config import Config
+from backend.latex_generator import generate_latex_code
+from backend.template_manager import template_preambles
+
+PARALLEL = "parallel"
+SINGLE_RUN = "single_run"
+BATCH_MODES = (PARALLEL, SINGLE_RUN)
+
+END_DOCUMENT = "\\end{document}"
+BOUNDARY_MARKER = "RESUME-BOUNDARY:"
+BOUNDARY_PATTERN = re.compile(re.escape(BOUNDARY_MARKER) + r"(\d+)")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker() -> None:
+    """Load the template formats the server already dumped into a batch worker process."""
+    latex_compiler.load_formats(template_preambles())
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared batch process pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=Config.BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class BatchBacklog:
+    """Thread-safe count of accepted batch items that have not finished yet."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+
+    def reserve(self, count: int) -> bool:
+        """
+        Accept ``count`` more items unless that would pass the limit.
+
+        A batch is always accepted when nothing else is pending, so a limit
+        below BATCH_MAX_ITEMS cannot lock out large batches for good.
+        """
+        with self._lock:
+            if self._pending and self._pending + count > self.limit:
+                self._rejected += 1
+                return False
+            self._pending += count
+            return True
+
+    def release(self, count: int) -> None:
+        with self._lock:
+            self._pending -= count
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"limit": self.limit, "pending": self._pending, "rejected": self._rejected}
+
+
+backlog = BatchBacklog(Config.BATCH_MAX_PENDING)
+
+
+def compile_batch_item(index: int, resume_data: Dict, template: str, industry: str) -> Dict:
+    """
+    Generate and compile one resume (runs in a batch worker process).
+
+    Returns:
+        Dictionary with the item index, status, PDF bytes or error message
+    """
+    result = {"index": index, "template": template, "status": "failed", "pdf": None, "error": None}
+
+    try:
+        latex_code = generate_latex_code(resume_data=resume_data, template_name=template, industry=industry)
+        output = latex_compiler.compile_latex(latex_code)
+    except subprocess.TimeoutExpired:
+        result["error"] = "PDF compilation timeout"
+        return result
+    except FileNotFoundError:
+        result["error"] = "pdflatex not found"
+        return result
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+
+    result["latex_code"] = latex_code
+    if output["success"]:
+        result.update(status="done", pdf=output["pdf"], passes=output["passes"])
+    elif output["diagnostics"]["errors"]:
+        result["error"] = f"PDF compilation failed: {latex_log.format_diagnostic(output['diagnostics']['errors'][0])}"
+    else:
+        result["error"] = "PDF compilation failed"
+    return result
+
+
+def combine_documents(preamble: str, bodies: List[str]) -> str:
+    """
+    Build one document from resume bodies that share a preamble.
+
+    Each body is isolated in a group, starts again at page 1 and is
+    followed by a page break and a log marker with the number of pages
+    shipped out so far, which gives the page boundaries independently of
+    what a template does with the page counter. The preamble is left
+    untouched so its precompiled format still applies.
+    """
+    parts = [preamble, latex_compiler.BEGIN_DOCUMENT, "\n"]
+    for body in bodies:
+        inner = body[len(latex_compiler.BEGIN_DOCUMENT):]
+        end = inner.rfind(END_DOCUMENT)
+        if end != -1:
+            inner = inner[:end]
+        parts.append("\\begingroup\n\\setcounter{page}{1}\n")
+        parts.append(inner)
+        parts.append(f"\n\\endgroup\n\\clearpage\n\\typeout{{{BOUNDARY_MARKER}\\the\\ReadonlyShipoutCounter}}\n")
+    parts.append(END_DOCUMENT + "\n")
+    return "".join(parts)
+
+
+def split_pdf(pdf: bytes, log: str, count: int) -> Optional[List[bytes]]:
+    """
+    Split a combined PDF at the boundaries logged by combine_documents.
+
+    Returns:
+        One PDF per resume, or None if the boundaries do not add up
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    # Each marker holds the number of pages shipped out up to the end of a resume
+    ends = [int(n) for n in BOUNDARY_PATTERN.findall(log)]
+    reader = PdfReader(io.BytesIO(pdf))
+    if len(ends) != count or ends != sorted(ends) or ends[-1] != len(reader.pages):
+        return None
+
+    pdfs = []
+    start = 0
+    for end in ends:
+        if end <= start:
+            return None
+        writer = PdfWriter()
+        for page in reader.pages[start:end]:
+            writer.add_page(page)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        pdfs.append(buffer.getvalue())
+        start = end
+    return pdfs
+
+
+def compile_single_run_group(entries: List[Tuple[int, Dict, str, str]]) -> List[Dict]:
+    """
+    Generate resumes and compile those sharing a preamble in one pdflatex run
+    (runs in a batch worker process).
+
+    Items whose combined run fails are compiled one by one instead.
+
+    Args:
+        entries: Tuples of (index, resume_data, template, industry)
+
+    Returns:
+        One result dictionary per entry, as returned by compile_batch_item
+    """
+    results = []
+    groups: Dict[str, List[Tuple[Tuple[int, Dict, str, str], Optional[str]]]] = {}
+
+    for entry in entries:
+        index, resume_data, template, industry = entry
+        try:
+            latex_code = generate_latex_code(resume_data=resume_data, template_name=template, industry=industry)
+        except Exception as e:
+            results.append({"index": index, "template": template, "status": "failed", "pdf": None, "error": str(e)})
+            continue
+        preamble, body = latex_compiler.split_preamble(latex_code)
+        groups.setdefault(preamble, []).append((entry, body))
+
+    for preamble, members in groups.items():
+        pdfs = None
+        output = None
+        bodies = [body for _, body in members]
+        if len(members) > 1 and all(body is not None for body in bodies):
+            try:
+                output = latex_compiler.compile_latex(combine_documents(preamble, bodies), keep_log=True)
+                if output["success"]:
+                    pdfs = split_pdf(output["pdf"], output["log"], len(members))
+            except (subprocess.TimeoutExpired, OSError, ValueError) as e:
+                print(f"Single-run compile of {len(members)} resumes failed: {e}")
+
+        if pdfs is None:
+            for entry, _ in members:
+                results.append(compile_batch_item(*entry))
+            continue
+
+        for ((index, _, template, _), _), pdf in zip(members, pdfs):
+            results.append({"index": index, "template": template, "status": "done",
+                            "pdf": pdf, "error": None, "passes": output["passes"]})
+
+    return results
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, non-seekable sink that lets zipfile emit the archive in chunks."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def item_name(index: int) -> str:
+    return f"resume_{index + 1:03d}"
+
+
+async def stream_zip(results: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """
+    Turn item results into a streamed ZIP archive.
+
+    Every finished item adds ``resume_NNN.pdf`` (or ``resume_NNN.error.txt``
+    with the LaTeX source as ``resume_NNN.tex``); ``status.json`` with the
+    per-item status is written last.
+    """
+    sink = _ZipStream()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+    statuses = []
+
+    try:
+        async for result in results:
+            name = item_name(result["index"])
+            if result["status"] == "done":
+                # PDFs are already compressed; storing them keeps CPU free
+                archive.writestr(f"{name}.pdf", result["pdf"], compress_type=zipfile.ZIP_STORED)
+            else:
+                archive.writestr(f"{name}.error.txt", result["error"] or "unknown error")
+                if result.get("latex_code"):
+                    archive.writestr(f"{name}.tex", result["latex_code"])
+
+            statuses.append({
+                "index": result["index"],
+                "file": f"{name}.pdf" if result["status"] == "done" else None,
+                "template": result["template"],
+                "status": result["status"],
+                "error": result["error"],
+            })
+            yield sink.drain()
+
+        statuses.sort(key=lambda s: s["index"])
+        archive.writestr("status.json", json.dumps({
+            "total": len(statuses),
+            "succeeded": sum(1 for s in statuses if s["status"] == "done"),
+            "items": statuses,
+        }, indent=2))
+    finally:
+        # Also runs when the client disconnects; the trailing bytes are then discarded
+        archive.close()
+
+    yield sink.drain()
+
+
+async def _guarded(index: int, template: str, job: Callable[[], Awaitable[Dict]]) -> Dict:
+    """Await a pool job, turning worker crashes into a failed item."""
+    try:
+        return await job()
+    except Exception as e:
+        return {"index": index, "template": template, "status": "failed", "pdf": None, "error": str(e)}
+
+
+def _track(task: asyncio.Task, count: int) -> asyncio.Task:
+    """Release ``count`` backlog items when a task ends (including when it is cancelled before it starts)."""
+    task.add_done_callback(lambda _: backlog.release(count))
+    return task
+
+
+async def _as_completed(tasks: List[asyncio.Task]) -> AsyncIterator[Any]:
+    """Yield task results in completion order, cancelling the rest if the consumer stops."""
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # Client went away: drop work that has not started yet
+        for task in tasks:
+            task.cancel()
+
+
+async def _parallel_results(tasks: List[asyncio.Task]) -> AsyncIterator[Dict]:
+    async for result in _as_completed(tasks):
+        yield result
+
+
+def run_parallel(items: List[Dict], scheduler: BoundedScheduler) -> AsyncIterator[Dict]:
+    """
+    Compile items on the process pool and yield results in completion order.
+
+    The items must already be reserved in the backlog; every item releases
+    its reservation when it ends.
+
+    Args:
+        items: Dictionaries with resume_data, template and industry
+        scheduler: Compile scheduler whose slots bound the pdflatex processes
+    """
+    executor = get_executor()
+    tasks = [
+        _track(asyncio.ensure_future(_guarded(index, item["template"], partial(
+            scheduler.run_background, executor, compile_batch_item,
+            index, item["resume_data"], item["template"], item["industry"]
+        ))), 1)
+        for index, item in enumerate(items)
+    ]
+    return _parallel_results(tasks)
+
+
+async def _guarded_chunk(chunk: List[Tuple[int, Dict, str, str]],
+                         job: Callable[[], Awaitable[List[Dict]]]) -> List[Dict]:
+    """Await a single-run chunk, turning worker crashes into failed items."""
+    try:
+        return await job()
+    except Exception as e:
+        return [{"index": index, "template": template, "status": "failed", "pdf": None, "error": str(e)}
+                for index, _, template, _ in chunk]
+
+
+async def _single_run_results(tasks: List[asyncio.Task]) -> AsyncIterator[Dict]:
+    async for results in _as_completed(tasks):
+        for result in results:
+            yield result
+
+
+def run_single_run(items: List[Dict], scheduler: BoundedScheduler) -> AsyncIterator[Dict]:
+    """
+    Compile items in shared single-run documents and yield results as chunks finish.
+
+    Items are grouped by template and cut into chunks of at most
+    Config.BATCH_SINGLE_RUN_SIZE, so large batches still spread over the pool.
+    Each chunk holds one scheduler slot; its items must already be reserved
+    in the backlog and are released when the chunk ends.
+
+    Args:
+        items: Dictionaries with resume_data, template and industry
+        scheduler: Compile scheduler whose slots bound the pdflatex processes
+    """
+    by_template: Dict[str, List[Tuple[int, Dict, str, str]]] = {}
+    for index, item in enumerate(items):
+        by_template.setdefault(item["template"], []).append(
+            (index, item["resume_data"], item["template"], item["industry"])
+        )
+
+    size = max(1, Config.BATCH_SINGLE_RUN_SIZE)
+    chunks = [entries[i:i + size] for entries in by_template.values() for i in range(0, len(entries), size)]
+
+    executor = get_executor()
+    tasks = [
+        _track(asyncio.ensure_future(_guarded_chunk(
+            chunk, partial(scheduler.run_background, executor, compile_single_run_group, chunk)
+        )), len(chunk))
+        for chunk in chunks
+    ]
+    return _single_run_results(tasks)
@@ -0,0 +1,185 @@
+"""
+Bounded Scheduler
+Bounded, non-blocking admission control for blocking work.
+
+Jobs run on a dedicated executor sized to the concurrency limit, so they
+never occupy the shared threadpool that serves the other endpoints.
+Callers beyond the limit wait in a bounded queue; once that queue is full
+new requests are rejected immediately with a Retry-After estimate.
+
+The server keeps one instance for pdflatex compiles and one for resume
+extraction, each with its own executor. Batch compiles run on their own
+process pool but take their slots from the compile scheduler (after
+interactive compiles), so the total number of pdflatex processes stays
+within one limit.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class QueueFull(Exception):
+    """Raised when a scheduler's wait queue cannot take another request."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedScheduler:
+    """Runs blocking functions with a concurrency limit and a bounded wait queue."""
+
+    def __init__(self, max_parallel: int, max_queue: int, name: str):
+        self.max_parallel = max(1, max_parallel)
+        self.max_queue = max(0, max_queue)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        # Free slots and the callers waiting for one; slots go to run() before run_background()
+        self._free = self.max_parallel
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._background_waiters: Deque[asyncio.Future] = deque()
+        self._waiting = 0
+        self._background_waiting = 0
+        self._running = 0
+        self._rejected = 0
+        self._completed = 0
+        self._avg_seconds = 2.0
+
+    def is_full(self) -> bool:
+        """True when a new request would be rejected."""
+        with self._lock:
+            return self._free == 0 and self._waiting >= self.max_queue
+
+    def retry_after(self, backlog: Optional[int] = None) -> int:
+        """
+        Estimate how many seconds until a queue slot frees up.
+
+        Args:
+            backlog: Jobs ahead of the caller (defaults to those running and waiting)
+        """
+        if backlog is None:
+            backlog = self._waiting + self._running
+        return max(1, math.ceil(self._avg_seconds * backlog / self.max_parallel))
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Run ``func(*args)`` on the scheduler's executor.
+
+        Raises:
+            QueueFull: all workers are busy and the wait queue is full
+        """
+        with self._lock:
+            if self._free == 0 and self._waiting >= self.max_queue:
+                self._rejected += 1
+                raise QueueFull(self.retry_after())
+            self._waiting += 1
+
+        try:
+            await self._acquire(self._waiters)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        return await self._start(self._executor, func, *args)
+
+    async def run_background(self, executor: Executor, func: Callable, *args) -> Any:
+        """
+        Run ``func(*args)`` on another executor under the same concurrency limit.
+
+        For bulk work with its own admission control (batch compiles on the
+        process pool): there is no wait-queue limit, and a free slot goes to
+        callers of run() first, so interactive jobs never queue behind
+        bulk work.
+        """
+        with self._lock:
+            self._background_waiting += 1
+        try:
+            await self._acquire(self._background_waiters)
+        finally:
+            with self._lock:
+                self._background_waiting -= 1
+
+        return await self._start(executor, func, *args)
+
+    async def _acquire(self, waiters: Deque[asyncio.Future]) -> None:
+        """Take a free slot or wait in ``waiters`` until one is handed over."""
+        with self._lock:
+            if self._free > 0:
+                self._free -= 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Handed a slot just as the caller went away: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand a slot to the next waiter (interactive first) or mark it free."""
+        with self._lock:
+            for waiters in (self._waiters, self._background_waiters):
+                while waiters:
+                    waiter = waiters.popleft()
+                    if not waiter.done():
+                        waiter.set_result(None)
+                        return
+            self._free += 1
+
+    async def _start(self, executor: Executor, func: Callable, *args) -> Any:
+        """Run a job in a held slot; the slot is freed when the job itself is done."""
+        with self._lock:
+            self._running += 1
+        started = time.monotonic()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BaseException:
+            self._finish(None, started)
+            raise
+
+        # The slot is held until the executor is done, not until the caller
+        # stops waiting: a cancelled caller leaves the job running
+        future.add_done_callback(lambda done: self._finish(done, started))
+        return await asyncio.shield(future)
+
+    def _finish(self, future: Optional[asyncio.Future], started: float) -> None:
+        """Free the slot of a finished job (runs on the event loop)."""
+        if future is not None and not future.cancelled():
+            future.exception()  # retrieved, even when nobody awaits it any more
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._running -= 1
+            self._completed += 1
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+        self._release()
+
+    def stats(self) -> Dict:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Dictionary with limits, current load and counters
+        """
+        with self._lock:
+            return {
+                "max_parallel": self.max_parallel,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "waiting": self._waiting,
+                "background_waiting": self._background_waiting,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_job_seconds": round(self._avg_seconds, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,131 @@
+"""
+Compile Jobs
+In-memory store for asynchronous compile jobs.
+
+A job is created by the submit endpoint and runs on the compile scheduler.
+Its state moves through queued -> running (reporting each pdflatex pass)
+-> done | failed. Subscribers are woken on every change, which backs both
+status polling and the server-sent events stream.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TERMINAL_STATES = (DONE, FAILED)
+
+
+class CompileJob:
+    """State of one asynchronous compile."""
+
+    def __init__(self, latex_code: str, cache_key: str, loop: asyncio.AbstractEventLoop):
+        self.id = uuid.uuid4().hex
+        self.latex_code = latex_code
+        self.cache_key = cache_key
+        self.state = QUEUED
+        self.pass_number = 0
+        self.cache_status: Optional[str] = None
+        self.error: Optional[str] = None
+        self.compile_errors: List[Dict] = []  # parsed pdflatex log errors of a failed compile
+        self.pdf: Optional[bytes] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    def to_dict(self) -> Dict:
+        """Public view of the job (no LaTeX source or PDF bytes)."""
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "pass": self.pass_number,
+            "cache": self.cache_status,
+            "error": self.error,
+            "compile_errors": self.compile_errors,
+            "pdf_url": f"/compile-jobs/{self.id}/pdf" if self.state == DONE else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class CompileJobStore:
+    """Keeps recent jobs and notifies subscribers about state changes."""
+
+    def __init__(self, max_jobs: int, ttl_seconds: int):
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, CompileJob] = {}
+        self._lock = threading.Lock()
+
+    def create(self, latex_code: str, cache_key: str) -> CompileJob:
+        """Register a new queued job (must be called from the event loop)."""
+        job = CompileJob(latex_code, cache_key, asyncio.get_running_loop())
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[CompileJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def update(self, job: CompileJob, **fields) -> None:
+        """Update job fields from any thread and wake subscribers on the event loop."""
+        with self._lock:
+            for name, value in fields.items():
+                setattr(job, name, value)
+            job.updated_at = time.time()
+            if job.state in TERMINAL_STATES:
+                job.latex_code = ""
+
+        job._loop.call_soon_threadsafe(self._notify, job)
+
+    def _notify(self, job: CompileJob) -> None:
+        changed, job._changed = job._changed, asyncio.Event()
+        changed.set()
+
+    def _prune(self) -> None:
+        """Drop expired finished jobs, then the oldest ones if over capacity."""
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.state in TERMINAL_STATES and now - job.updated_at > self.ttl_seconds:
+                del self._jobs[job_id]
+
+        while len(self._jobs) >= self.max_jobs:
+            oldest = min(self._jobs.values(), key=lambda j: j.created_at)
+            del self._jobs[oldest.id]
+
+    async def events(self, job: CompileJob, keepalive_seconds: int = 15) -> AsyncIterator[str]:
+        """
+        Yield server-sent events for every state change until the job finishes.
+
+        Args:
+            job: Job to follow
+            keepalive_seconds: Interval for comment lines that keep proxies from timing out
+
+        Yields:
+            SSE-formatted "event: state" messages with the job as JSON data
+        """
+        last = None
+        while True:
+            changed = job._changed
+            snapshot = job.to_dict()
+            if snapshot != last:
+                yield f"event: state\ndata: {json.dumps(snapshot)}\n\n"
+                last = snapshot
+
+            if job.state in TERMINAL_STATES:
+                return
+
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
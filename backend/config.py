@@ -27,6 +27,7 @@ class Config :
     HOST: str = os.getenv( "HOST", "0.0.0.0" )
     PORT: int = int( os.getenv( "PORT", "8000" ) )
     STREAMLIT_PORT: int = int( os.getenv( "STREAMLIT_PORT", "8501" ) )
+    GZIP_MIN_SIZE: int = int( os.getenv( "GZIP_MIN_SIZE", "1024" ) )  # smallest response body worth compressing
 
     # =====================================================
     # Security Configuration
@@ -49,6 +50,11 @@ class Config :
         "ALLOWED_RESUME_EXTENSIONS",
         ".pdf,.docx,.txt"
     ).split( "," )
+    EXTRACTION_WORKERS: int = int( os.getenv( "EXTRACTION_WORKERS", "4" ) )  # concurrent resume extractions
+    EXTRACTION_MAX_QUEUE: int = int( os.getenv( "EXTRACTION_MAX_QUEUE", "16" ) )  # uploads allowed to wait
+    PDF_EXTRACT_MAX_PAGES: int = int( os.getenv( "PDF_EXTRACT_MAX_PAGES", "10" ) )  # pages read from an upload
+    PDF_EXTRACT_WORKERS: int = int( os.getenv( "PDF_EXTRACT_WORKERS", str( min( 4, os.cpu_count() or 2 ) ) ) )
+    PDF_PARALLEL_MIN_PAGES: int = int( os.getenv( "PDF_PARALLEL_MIN_PAGES", "6" ) )  # smaller PDFs are read serially
 
     # =====================================================
     # LaTeX Configuration
@@ -57,6 +63,48 @@ class Config :
         "PDFLATEX_PATH"
     ) or r"C:\Users\somas\AppData\Local\Programs\MiKTeX\miktex\bin\x64\pdflatex.exe"
     LATEX_TIMEOUT: int = int( os.getenv( "LATEX_TIMEOUT", "30" ) )
+    LATEX_WORKSPACE_ROOT: Optional[str] = os.getenv( "LATEX_WORKSPACE_ROOT" ) or None  # default: /dev/shm
+    LATEX_WORKSPACES: int = int( os.getenv( "LATEX_WORKSPACES", "8" ) )  # pre-created compile directories
+    LATEX_MAX_PASSES: int = int( os.getenv( "LATEX_MAX_PASSES", "3" ) )  # upper bound for reruns
+    LATEX_CPU_LIMIT: int = int( os.getenv( "LATEX_CPU_LIMIT", "30" ) )  # CPU seconds per pdflatex process, 0 = off
+    LATEX_MEMORY_LIMIT_MB: int = int( os.getenv( "LATEX_MEMORY_LIMIT_MB", "1024" ) )  # address space, 0 = off
+    LATEX_MAX_OUTPUT_MB: int = int( os.getenv( "LATEX_MAX_OUTPUT_MB", "50" ) )  # largest file pdflatex may write, 0 = off
+    ENABLE_LATEX_LINT: bool = os.getenv( "ENABLE_LATEX_LINT", "true" ).lower() == "true"  # pre-flight check
+    LATEX_MAX_SOURCE_KB: int = int( os.getenv( "LATEX_MAX_SOURCE_KB", "512" ) )  # largest accepted LaTeX source
+    ENABLE_LATEX_WARM_POOL: bool = os.getenv( "ENABLE_LATEX_WARM_POOL", "true" ).lower() == "true"
+    LATEX_WARM_WORKERS: int = int( os.getenv( "LATEX_WARM_WORKERS", "2" ) )  # per precompiled preamble
+    LATEX_MAX_PARALLEL: int = int( os.getenv( "LATEX_MAX_PARALLEL", str( os.cpu_count() or 2 ) ) )
+    LATEX_MAX_QUEUE: int = int( os.getenv( "LATEX_MAX_QUEUE", "16" ) )  # compiles allowed to wait for a slot
+    BATCH_WORKERS: int = int( os.getenv( "BATCH_WORKERS", str( os.cpu_count() or 2 ) ) )  # batch process pool size
+    BATCH_MAX_ITEMS: int = int( os.getenv( "BATCH_MAX_ITEMS", "500" ) )
+    BATCH_MAX_PENDING: int = int( os.getenv( "BATCH_MAX_PENDING", "1000" ) )  # unfinished items of all batches
+    BATCH_SINGLE_RUN_SIZE: int = int( os.getenv( "BATCH_SINGLE_RUN_SIZE", "50" ) )  # resumes per shared pdflatex run
+    COMPILE_JOB_TTL: int = int( os.getenv( "COMPILE_JOB_TTL", "600" ) )  # seconds finished jobs are kept
+    COMPILE_JOB_MAX: int = int( os.getenv( "COMPILE_JOB_MAX", "1000" ) )
+    PAGE_FIT_BUDGET: float = float( os.getenv( "PAGE_FIT_BUDGET", "20" ) )  # seconds to search layout variants
+    ENABLE_PDF_OPTIMIZATION: bool = os.getenv( "ENABLE_PDF_OPTIMIZATION", "true" ).lower() == "true"  # pypdf pass
+    ENABLE_PDF_LINEARIZE: bool = os.getenv( "ENABLE_PDF_LINEARIZE", "true" ).lower() == "true"  # needs qpdf
+    QPDF_PATH: Optional[str] = os.getenv( "QPDF_PATH" ) or None
+
+    # =====================================================
+    # Cache Configuration
+    # =====================================================
+    CACHE_DIR: str = os.getenv(
+        "CACHE_DIR",
+        os.path.join( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ), "simple_db", "cache" )
+    )
+    LATEX_FORMAT_DIR: str = os.getenv( "LATEX_FORMAT_DIR", os.path.join( CACHE_DIR, "formats" ) )
+    ENABLE_PDF_CACHE: bool = os.getenv( "ENABLE_PDF_CACHE", "true" ).lower() == "true"
+    PDF_CACHE_MEMORY_MB: int = int( os.getenv( "PDF_CACHE_MEMORY_MB", "64" ) )
+    PDF_CACHE_DISK_MB: int = int( os.getenv( "PDF_CACHE_DISK_MB", "512" ) )
+    THUMBNAIL_DPI: int = int( os.getenv( "THUMBNAIL_DPI", "40" ) )
+    THUMBNAIL_CACHE_MEMORY_MB: int = int( os.getenv( "THUMBNAIL_CACHE_MEMORY_MB", "32" ) )
+    THUMBNAIL_CACHE_DISK_MB: int = int( os.getenv( "THUMBNAIL_CACHE_DISK_MB", "256" ) )
+    SECTION_CACHE_MEMORY_MB: int = int( os.getenv( "SECTION_CACHE_MEMORY_MB", "16" ) )  # rendered sections, 0 = off
+    ENABLE_LLM_CACHE: bool = os.getenv( "ENABLE_LLM_CACHE", "true" ).lower() == "true"
+    LLM_CACHE_MEMORY_MB: int = int( os.getenv( "LLM_CACHE_MEMORY_MB", "16" ) )
+    LLM_CACHE_DISK_MB: int = int( os.getenv( "LLM_CACHE_DISK_MB", "128" ) )
+    LLM_CACHE_TTL: int = int( os.getenv( "LLM_CACHE_TTL", str( 7 * 24 * 3600 ) ) )  # seconds, 0 = never expire
 
     # =====================================================
     # Logging Configuration
@@ -152,8 +200,24 @@ class Config :
             "features" : {
                 "ai_extraction" : cls.ENABLE_AI_EXTRACTION,
                 "pdf_compilation" : cls.ENABLE_PDF_COMPILATION,
+                "pdf_optimization" : cls.ENABLE_PDF_OPTIMIZATION,
                 "suggestions" : cls.ENABLE_SUGGESTIONS
             },
+            "latex_limits" : {
+                "timeout_seconds" : cls.LATEX_TIMEOUT,
+                "cpu_seconds" : cls.LATEX_CPU_LIMIT,
+                "memory_mb" : cls.LATEX_MEMORY_LIMIT_MB,
+                "max_output_mb" : cls.LATEX_MAX_OUTPUT_MB,
+                "shell_escape" : False
+            },
+            "cache" : {
+                "directory" : cls.CACHE_DIR,
+                "pdf_cache" : cls.ENABLE_PDF_CACHE,
+                "pdf_cache_memory_mb" : cls.PDF_CACHE_MEMORY_MB,
+                "pdf_cache_disk_mb" : cls.PDF_CACHE_DISK_MB,
+                "llm_cache" : cls.ENABLE_LLM_CACHE,
+                "llm_cache_ttl_seconds" : cls.LLM_CACHE_TTL
+            },
             "uploads" : {
                 "max_size_mb" : cls.MAX_UPLOAD_SIZE,
                 "allowed_cert_types" : cls.ALLOWED_CERT_EXTENSIONS,
@@ -0,0 +1,287 @@
+"""
+Content Cache
+Size-capped, content-addressed byte cache with an in-memory LRU tier
+and an optional on-disk tier behind it. Entries can also expire after a
+fixed time.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def content_hash(*parts: str) -> str:
+    """
+    Build a stable SHA-256 key from one or more string parts.
+
+    Args:
+        parts: Strings that together identify the cached content
+
+    Returns:
+        Hex digest usable as a cache key and file name
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ContentCache:
+    """
+    Two-tier LRU cache for immutable byte payloads.
+
+    The memory tier holds the most recently used entries up to
+    ``max_memory_bytes``. When ``disk_dir`` is set, every entry is also
+    written to disk (capped at ``max_disk_bytes``, oldest files evicted
+    first) so that it survives restarts and memory eviction.
+
+    With ``ttl_seconds`` set, an entry expires that long after it was
+    stored, in both tiers (the file modification time is its store time).
+    """
+
+    def __init__(self, name: str, max_memory_bytes: int,
+                 disk_dir: Optional[str] = None, max_disk_bytes: int = 0,
+                 ttl_seconds: Optional[int] = None):
+        self.name = name
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds or None
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._stored_at: Dict[str, float] = {}  # only kept with a TTL
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "expired": 0}
+
+        if self.disk_dir:
+            self._load_disk_index()
+
+    # -----------------------------------------------------
+    # Public API
+    # -----------------------------------------------------
+    def lookup(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, tier) where tier is "memory", "disk" or None on a miss
+        """
+        with self._lock:
+            if self._expired(key):
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                expired_path = self._forget(key)
+            else:
+                expired_path = None
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value, "memory"
+
+        if expired_path:
+            self._remove_file(expired_path)
+            return None, None
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None, None
+            self._stats["disk_hits"] += 1
+            self._remember(key, value)
+            return value, "disk"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value for ``key`` or None."""
+        return self.lookup(key)[0]
+
+    def put(self, key: str, value: bytes) -> None:
+        """
+        Store an entry in both tiers.
+
+        Args:
+            key: Cache key
+            value: Bytes to cache
+        """
+        with self._lock:
+            self._stats["stores"] += 1
+            if self.ttl_seconds:
+                self._stored_at[key] = time.time()
+            self._remember(key, value)
+
+        self._write_disk(key, value)
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and tier sizes
+        """
+        with self._lock:
+            lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = lookups - self._stats["misses"]
+            return {
+                "name": self.name,
+                **self._stats,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk_index),
+                "disk_bytes": self._disk_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    # -----------------------------------------------------
+    # Expiry
+    # -----------------------------------------------------
+    def _expired(self, key: str) -> bool:
+        """True for an entry past its TTL (caller holds the lock)."""
+        if not self.ttl_seconds:
+            return False
+        stored_at = self._stored_at.get(key)
+        return stored_at is not None and time.time() - stored_at > self.ttl_seconds
+
+    def _forget(self, key: str) -> Optional[str]:
+        """Drop an entry from both tiers (caller holds the lock); returns the file to delete."""
+        self._stored_at.pop(key, None)
+        value = self._memory.pop(key, None)
+        if value is not None:
+            self._memory_bytes -= len(value)
+        size = self._disk_index.pop(key, None)
+        if size is None:
+            return None
+        self._disk_bytes -= size
+        return self._path(key)
+
+    def _drop_stored_at(self, key: str) -> None:
+        """Forget the store time once an entry has left both tiers (caller holds the lock)."""
+        if self.ttl_seconds and key not in self._memory and key not in self._disk_index:
+            self._stored_at.pop(key, None)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # -----------------------------------------------------
+    # Memory tier
+    # -----------------------------------------------------
+    def _remember(self, key: str, value: bytes) -> None:
+        """Insert into the memory tier and evict least recently used entries."""
+        if len(value) > self.max_memory_bytes:
+            return
+
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+
+        self._memory[key] = value
+        self._memory_bytes += len(value)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            evicted_key, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._drop_stored_at(evicted_key)
+
+    # -----------------------------------------------------
+    # Disk tier
+    # -----------------------------------------------------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def _load_disk_index(self) -> None:
+        """Rebuild the disk index (oldest first) from files left by earlier runs, dropping expired ones."""
+        os.makedirs(self.disk_dir, exist_ok=True)
+
+        now = time.time()
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for file_name in files:
+                if file_name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, file_name))
+                except OSError:
+                    continue
+                if self.ttl_seconds and now - stat.st_mtime > self.ttl_seconds:
+                    self._remove_file(os.path.join(root, file_name))
+                    continue
+                entries.append((stat.st_mtime, file_name, stat.st_size))
+
+        for mtime, key, size in sorted(entries):
+            self._disk_index[key] = size
+            self._disk_bytes += size
+            if self.ttl_seconds:
+                self._stored_at[key] = mtime
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+
+        with self._lock:
+            if key not in self._disk_index:
+                return None
+            self._disk_index.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read()
+            if not self.ttl_seconds:
+                # Recency for the next start; with a TTL the mtime is the store time
+                os.utime(path)
+            return value
+        except OSError:
+            with self._lock:
+                size = self._disk_index.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+                self._drop_stored_at(key)
+            return None
+
+    def _write_disk(self, key: str, value: bytes) -> None:
+        if not self.disk_dir or len(value) > self.max_disk_bytes:
+            return
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"{self.name} cache: disk write failed: {e}")
+            return
+
+        evicted = []
+        with self._lock:
+            old = self._disk_index.pop(key, None)
+            if old is not None:
+                self._disk_bytes -= old
+            self._disk_index[key] = len(value)
+            self._disk_bytes += len(value)
+
+            while self._disk_bytes > self.max_disk_bytes and self._disk_index:
+                old_key, size = self._disk_index.popitem(last=False)
+                self._disk_bytes -= size
+                self._drop_stored_at(old_key)
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            self._remove_file(self._path(old_key))
@@ -0,0 +1,643 @@
+"""
+LaTeX Compile Engine
+Compiles LaTeX source to PDF with pdflatex.
+
+Every compile runs in a reusable workspace from a RAM-backed pool.
+Known preambles (the shared template headers) are dumped once into a
+pdflatex format file. For each of them a small pool of pre-started
+pdflatex workers is kept with the format already loaded; such a worker
+only has to read the document body, which skips process startup and
+package loading on the hot path. Anything else compiles cold.
+
+Every pdflatex process (format dumps included) runs with shell escape
+disabled, with kpathsea's paranoid file access (no reading or writing
+absolute paths outside its workspace, parent directories or dotfiles),
+in its own process group and (on POSIX) under per-job limits
+for CPU time, address space and written file size, so a runaway document
+cannot starve or fill up the host. The limits are set by a /bin/sh
+wrapper that then execs pdflatex, so no Python code runs in the child
+between fork and exec. On timeout the whole process group is killed.
+
+The log of the last pass is parsed into structured diagnostics (errors
+with source line and command, warnings, overfull boxes).
+"""
+
+import errno
+import hashlib
+import os
+import queue
+import re
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend import latex_log
+from backend.config import Config
+from backend.content_cache import content_hash
+
+BEGIN_DOCUMENT = "\\begin{document}"
+JOB_NAME = "resume"
+
+
+def pdflatex_command() -> str:
+    """Resolve the pdflatex executable (configured path first, then PATH)."""
+    if Config.PDFLATEX_PATH and Path(Config.PDFLATEX_PATH).exists():
+        return Config.PDFLATEX_PATH
+    return shutil.which("pdflatex") or "pdflatex"
+
+
+@lru_cache(maxsize=1)
+def get_engine_version() -> str:
+    """Return the first line of `pdflatex --version`, used to key caches and formats."""
+    try:
+        result = subprocess.run([pdflatex_command(), '--version'], capture_output=True, text=True, timeout=5)
+        return result.stdout.splitlines()[0] if result.stdout else "unknown"
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+
+
+def split_preamble(latex_code: str) -> Tuple[str, Optional[str]]:
+    """
+    Split LaTeX source at \\begin{document}.
+
+    Returns:
+        Tuple of (preamble, body); body starts with \\begin{document} and is
+        None when the source has no document environment
+    """
+    index = latex_code.find(BEGIN_DOCUMENT)
+    if index == -1:
+        return latex_code, None
+    return latex_code[:index], latex_code[index:]
+
+
+def _read_output(workdir: str) -> Dict:
+    """Collect the PDF left in a workspace by a pdflatex run."""
+    pdf_file = Path(workdir) / f"{JOB_NAME}.pdf"
+    return {"pdf": pdf_file.read_bytes() if pdf_file.exists() else None}
+
+
+def _scan_log(workdir: str, line_offset: int, keep_log: bool) -> Dict:
+    """
+    Stream the log of the last pass through the diagnostics parser and the rerun check.
+
+    The log file is read line by line and only kept as text when asked for.
+
+    Returns:
+        Dictionary with diagnostics, rerun_requested and (with keep_log) log
+    """
+    log_file = Path(workdir) / f"{JOB_NAME}.log"
+    parser = latex_log.LogParser(line_offset)
+    rerun_requested = False
+    lines = []
+
+    if log_file.exists():
+        with open(log_file, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parser.feed(line)
+                if not rerun_requested and RERUN_PATTERN.search(line):
+                    rerun_requested = True
+                if keep_log:
+                    lines.append(line)
+
+    scan = {"diagnostics": parser.result(), "rerun_requested": rerun_requested}
+    if keep_log:
+        scan["log"] = "".join(lines)
+    return scan
+
+
+# =====================================================
+# Resource governor
+# =====================================================
+# Must precede the input file; \write18 and friends are then unavailable
+NO_SHELL_ESCAPE = '-no-shell-escape'
+
+
+def _ulimit(option: str, soft: int, hard: Optional[int] = None) -> str:
+    """Shell commands lowering one limit; they fail quietly above the hard limit inherited from the server."""
+    hard = soft if hard is None else hard
+    return f"ulimit -S {option} {soft} 2>/dev/null; ulimit -H {option} {hard} 2>/dev/null; "
+
+
+def governed(command: List[str]) -> List[str]:
+    """
+    Wrap a pdflatex command line so it runs under the per-job limits.
+
+    On POSIX the limits are applied by /bin/sh, which then execs pdflatex
+    (same pid, so process-group kills still reach it). Elsewhere the
+    command is returned unchanged and only the timeout applies.
+
+    Raises:
+        FileNotFoundError: the executable is not installed (checked here,
+            since the shell would only report it as exit code 127)
+    """
+    if shutil.which(command[0]) is None:
+        raise FileNotFoundError(errno.ENOENT, "pdflatex not found", command[0])
+    if os.name != "posix":
+        return command
+
+    script = ""
+    if Config.LATEX_CPU_LIMIT > 0:
+        # SIGXCPU at the soft limit, SIGKILL one second later
+        script += _ulimit("-t", Config.LATEX_CPU_LIMIT, Config.LATEX_CPU_LIMIT + 1)
+    if Config.LATEX_MEMORY_LIMIT_MB > 0:
+        script += _ulimit("-v", Config.LATEX_MEMORY_LIMIT_MB * 1024)  # KiB
+    if Config.LATEX_MAX_OUTPUT_MB > 0:
+        script += _ulimit("-f", Config.LATEX_MAX_OUTPUT_MB * 2048)  # 512-byte blocks
+    if not script:
+        return command
+    return ["/bin/sh", "-c", script + 'exec "$@"', "pdflatex", *command]
+
+
+def process_options(workdir: str) -> Dict:
+    """
+    Popen keyword arguments that sandbox a pdflatex process working in ``workdir``.
+
+    openin_any/openout_any = p (paranoid) make kpathsea refuse \\input,
+    \\openin and \\openout of dotfiles, parent directories and absolute
+    paths outside TEXMFOUTPUT (the workspace), however the command that asks
+    for them is spelled. On POSIX the process also gets its own process group.
+    """
+    env = {**os.environ, "openin_any": "p", "openout_any": "p", "TEXMFOUTPUT": workdir}
+    if os.name != "posix":
+        return {"env": env}
+    return {"env": env, "start_new_session": True}
+
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    """Kill a process and anything it spawned, then reap it."""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.communicate()
+
+
+def communicate(process: subprocess.Popen, stdin: Optional[str], timeout: int) -> Tuple[str, str]:
+    """
+    Wait for a governed process, killing its whole process group on timeout.
+
+    Raises:
+        subprocess.TimeoutExpired: the process did not finish in time
+    """
+    try:
+        return process.communicate(stdin, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        kill_process_group(process)
+        raise
+
+
+def _scrub(workdir: str) -> None:
+    """Remove everything inside a workspace directory."""
+    for entry in os.scandir(workdir):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+# =====================================================
+# Reusable workspaces
+# =====================================================
+def default_workspace_root() -> str:
+    """Prefer a RAM-backed tmpfs for compile workspaces when one is available."""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+class WorkspacePool:
+    """
+    Pre-created compile directories that are scrubbed and reused between jobs.
+
+    By default the directories live on tmpfs (/dev/shm), so writing the source
+    and reading back the PDF never touches a disk, and no directory is created
+    or deleted per request.
+    """
+
+    def __init__(self, root: str, size: int):
+        self.root = root
+        self.size = size
+        self._idle: "queue.Queue[str]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _create(self) -> str:
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock:
+            self._created += 1
+        return tempfile.mkdtemp(prefix="resume-ws-", dir=self.root)
+
+    def fill(self) -> None:
+        """Pre-create workspaces up to the pool size."""
+        while self._idle.qsize() < self.size:
+            self._idle.put(self._create())
+
+    def acquire(self) -> str:
+        """Take a clean workspace, creating one if the pool is empty."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._create()
+
+    def release(self, workdir: str) -> None:
+        """Scrub a workspace and return it to the pool (or delete it if the pool is full)."""
+        if self._idle.qsize() >= self.size:
+            shutil.rmtree(workdir, ignore_errors=True)
+            return
+
+        try:
+            _scrub(workdir)
+        except OSError:
+            shutil.rmtree(workdir, ignore_errors=True)
+            return
+        self._idle.put(workdir)
+
+    def close(self) -> None:
+        while True:
+            try:
+                shutil.rmtree(self._idle.get_nowait(), ignore_errors=True)
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict:
+        return {"root": self.root, "idle": self._idle.qsize(), "size": self.size, "created": self._created}
+
+
+workspaces = WorkspacePool(Config.LATEX_WORKSPACE_ROOT or default_workspace_root(), Config.LATEX_WORKSPACES)
+
+
+# =====================================================
+# Precompiled formats and warm workers
+# =====================================================
+class WarmWorker:
+    """
+    A pdflatex process started with a precompiled format.
+
+    The process loads the format and then blocks on its first input line,
+    so by the time a job arrives only the document body is left to do.
+    Workers are single-use: pdflatex exits at \\end{document}.
+    """
+
+    def __init__(self, format_file: str):
+        self.workdir = workspaces.acquire()
+        self.process = subprocess.Popen(
+            governed([pdflatex_command(), f'-fmt={format_file}', NO_SHELL_ESCAPE, '-interaction=nonstopmode',
+                      f'-jobname={JOB_NAME}', '-output-directory', self.workdir]),
+            cwd=self.workdir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            **process_options(self.workdir),
+        )
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, body: str, timeout: int) -> Dict:
+        """Feed the document body to the waiting process and collect the result."""
+        (Path(self.workdir) / "body.tex").write_text(body, encoding='utf-8')
+
+        stdout, stderr = communicate(self.process, "\\input{body.tex}\n", timeout)
+
+        output = _read_output(self.workdir)
+        output.update({"stdout": stdout, "stderr": stderr, "returncode": self.process.returncode})
+        return output
+
+    def close(self) -> None:
+        if self.alive():
+            kill_process_group(self.process)
+        workspaces.release(self.workdir)
+
+
+class WarmPool:
+    """
+    Pre-started workers for one precompiled preamble.
+
+    With size 0 nothing is kept running: every compile starts pdflatex
+    with the format on demand.
+    """
+
+    def __init__(self, format_file: str, size: int):
+        self.format_file = format_file
+        self.size = size
+        self._idle: "queue.Queue[WarmWorker]" = queue.Queue()
+
+        for _ in range(size):
+            self._idle.put(WarmWorker(format_file))
+
+    def acquire(self) -> WarmWorker:
+        """Take a warm worker (starting a fresh one if none is idle) and refill the pool."""
+        worker = None
+        while worker is None:
+            try:
+                candidate = self._idle.get_nowait()
+            except queue.Empty:
+                candidate = WarmWorker(self.format_file)
+            if candidate.alive():
+                worker = candidate
+            else:
+                candidate.close()
+
+        if self._idle.qsize() < self.size:
+            self._idle.put(WarmWorker(self.format_file))
+
+        return worker
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools: Dict[str, WarmPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _format_name(preamble: str) -> str:
+    return "resume-" + content_hash(get_engine_version(), preamble)[:16]
+
+
+def format_path(preamble: str) -> str:
+    """Where the probed format of a preamble is published (what load_formats looks for)."""
+    return os.path.join(Config.LATEX_FORMAT_DIR, f"{_format_name(preamble)}.fmt")
+
+
+def dump_format(preamble: str) -> Optional[str]:
+    """
+    Precompile a preamble into a pdflatex format file (once per engine version).
+
+    A fresh dump is written next to the published path under an
+    "-unverified" name; warm_up publishes it only after its probe passes.
+
+    Args:
+        preamble: LaTeX source up to (not including) \\begin{document}
+
+    Returns:
+        Path to the published .fmt file if there is one, else to the fresh
+        unverified dump, or None if dumping failed
+    """
+    format_dir = Config.LATEX_FORMAT_DIR
+    name = _format_name(preamble)
+    if os.path.exists(format_path(preamble)):
+        return format_path(preamble)
+    format_file = os.path.join(format_dir, f"{name}-unverified.fmt")
+
+    os.makedirs(format_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = Path(tmpdir) / f"{name}.tex"
+        source.write_text(preamble + BEGIN_DOCUMENT + "\n\\end{document}\n", encoding='utf-8')
+
+        try:
+            subprocess.run(
+                governed([pdflatex_command(), '-ini', NO_SHELL_ESCAPE, '-interaction=nonstopmode',
+                          f'-jobname={name}', '-output-directory', tmpdir, '&pdflatex', 'mylatexformat.ltx',
+                          source.name]),
+                cwd=tmpdir,
+                capture_output=True,
+                text=True,
+                timeout=Config.LATEX_TIMEOUT * 4,
+                **process_options(tmpdir)
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"Format dump failed for {name}: {e}")
+            return None
+
+        dumped = Path(tmpdir) / f"{name}.fmt"
+        if not dumped.exists():
+            print(f"Format dump failed for {name}")
+            return None
+
+        shutil.move(str(dumped), format_file)
+
+    return format_file
+
+
+def _discard_format(format_file: str) -> None:
+    """Delete a format that failed its probe; a published one would otherwise be used by load_formats."""
+    try:
+        os.remove(format_file)
+    except OSError:
+        pass
+
+
+def warm_up(preambles: Iterable[str]) -> None:
+    """
+    Dump formats and start warm worker pools for the given preambles.
+
+    Each format is smoke-tested with an empty document first; preambles that
+    cannot be dumped or do not compile from their format keep the cold path.
+    """
+    workspaces.fill()
+
+    if not Config.ENABLE_LATEX_WARM_POOL:
+        return
+
+    for preamble in preambles:
+        key = content_hash(preamble)
+        with _pools_lock:
+            if key in _pools:
+                continue
+
+        format_file = dump_format(preamble)
+        if not format_file:
+            continue
+
+        probe_worker = None
+        try:
+            probe_worker = WarmWorker(format_file)
+            probe = probe_worker.run(BEGIN_DOCUMENT + "\\mbox{}\\end{document}\n", Config.LATEX_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"Warm worker probe failed: {e}")
+            _discard_format(format_file)
+            continue
+        finally:
+            if probe_worker:
+                probe_worker.close()
+        if not probe["pdf"]:
+            print(f"Precompiled format {format_file} does not produce output, using cold compiles")
+            _discard_format(format_file)
+            continue
+
+        if format_file != format_path(preamble):
+            os.replace(format_file, format_path(preamble))
+            format_file = format_path(preamble)
+
+        with _pools_lock:
+            _pools[key] = WarmPool(format_file, Config.LATEX_WARM_WORKERS)
+        print(f"Warm pdflatex pool ready ({Config.LATEX_WARM_WORKERS} workers, {os.path.basename(format_file)})")
+
+
+def load_formats(preambles: Iterable[str]) -> None:
+    """
+    Compile the given preambles from formats already on disk, without warm workers.
+
+    For processes that share the server's format directory (batch workers):
+    formats there were dumped and probed by warm_up, so nothing is dumped,
+    probed or pre-started here. Each compile starts pdflatex with the
+    format; preambles without a format on disk compile cold.
+    """
+    if not Config.ENABLE_LATEX_WARM_POOL:
+        return
+
+    for preamble in preambles:
+        format_file = format_path(preamble)
+        if os.path.exists(format_file):
+            with _pools_lock:
+                _pools.setdefault(content_hash(preamble), WarmPool(format_file, 0))
+
+
+def warm_up_in_background(preambles: Iterable[str]) -> threading.Thread:
+    """Run warm_up on a daemon thread so server startup is not delayed."""
+    thread = threading.Thread(target=warm_up, args=(list(preambles),), daemon=True)
+    thread.start()
+    return thread
+
+
+def shutdown() -> None:
+    """Stop all idle warm workers and remove idle workspaces."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+    workspaces.close()
+
+
+# =====================================================
+# Compilation
+# =====================================================
+# Log messages that mean another pass would change the output
+RERUN_PATTERN = re.compile(
+    r"Rerun to get|Rerun LaTeX|Please rerun LaTeX|Label\(s\) may have changed"
+)
+
+
+def _aux_digest(workdir: str) -> Optional[str]:
+    aux_file = Path(workdir) / f"{JOB_NAME}.aux"
+    if not aux_file.exists():
+        return None
+    return hashlib.sha256(aux_file.read_bytes()).hexdigest()
+
+
+def needs_rerun(rerun_requested: bool, aux_before: Optional[str], aux_after: Optional[str], pass_number: int) -> bool:
+    """
+    Decide whether another pdflatex pass is required.
+
+    LaTeX's own rerun warnings always trigger another pass. From the second
+    pass on, a changed .aux file does too; the first pass always creates
+    the .aux, so that alone is not a reason to rerun.
+    """
+    if rerun_requested:
+        return True
+    return pass_number > 1 and aux_before != aux_after
+
+
+def _run_pass(workdir: str, format_file: Optional[str], timeout: int) -> Dict:
+    """Run one pdflatex pass in a prepared workspace (resume.tex, or body.tex with a format)."""
+    if format_file:
+        command = [pdflatex_command(), f'-fmt={format_file}', NO_SHELL_ESCAPE, '-interaction=nonstopmode',
+                   f'-jobname={JOB_NAME}', '-output-directory', workdir, '\\input{body.tex}']
+    else:
+        command = [pdflatex_command(), NO_SHELL_ESCAPE, '-interaction=nonstopmode', '-output-directory', workdir,
+                   f"{JOB_NAME}.tex"]
+
+    # A failed pass must not pick up the PDF or log of the previous one
+    for suffix in (".pdf", ".log"):
+        stale = Path(workdir) / f"{JOB_NAME}{suffix}"
+        if stale.exists():
+            stale.unlink()
+
+    process = subprocess.Popen(governed(command), cwd=workdir, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True, **process_options(workdir))
+    stdout, stderr = communicate(process, None, timeout)
+
+    output = _read_output(workdir)
+    output.update({"stdout": stdout, "stderr": stderr, "returncode": process.returncode})
+    return output
+
+
+def _run_passes(workdir: str, first_pass: Callable[[], Dict], format_file: Optional[str],
+                timeout: int, on_progress: Optional[Callable[[int], None]],
+                line_offset: int, keep_log: bool) -> Dict:
+    """Run pdflatex until the output is stable or LATEX_MAX_PASSES is reached."""
+    pass_number = 0
+    while True:
+        pass_number += 1
+        if on_progress:
+            on_progress(pass_number)
+
+        aux_before = _aux_digest(workdir)
+        output = first_pass() if pass_number == 1 else _run_pass(workdir, format_file, timeout)
+        output["passes"] = pass_number
+        output.update(_scan_log(workdir, line_offset, keep_log))
+
+        if output["pdf"] is None or pass_number >= Config.LATEX_MAX_PASSES:
+            return output
+        if not needs_rerun(output.pop("rerun_requested"), aux_before, _aux_digest(workdir), pass_number):
+            return output
+
+
+def compile_latex(latex_code: str, timeout: Optional[int] = None,
+                  on_progress: Optional[Callable[[int], None]] = None, keep_log: bool = False) -> Dict:
+    """
+    Compile LaTeX source to PDF.
+
+    pdflatex is rerun only while the log asks for it or the .aux file keeps
+    changing, up to Config.LATEX_MAX_PASSES.
+
+    Args:
+        latex_code: Complete LaTeX document
+        timeout: Seconds before each pdflatex pass is killed (defaults to Config.LATEX_TIMEOUT)
+        on_progress: Called with the pass number before each pdflatex pass
+        keep_log: Also return the log text (otherwise it is only streamed
+            through the parser)
+
+    Returns:
+        Dictionary with success flag, PDF bytes, parsed log diagnostics
+        (line numbers refer to latex_code), process output, number of
+        passes, whether a warm worker was used and, with keep_log, the log text
+
+    Raises:
+        subprocess.TimeoutExpired: pdflatex did not finish in time
+        FileNotFoundError: pdflatex is not installed
+    """
+    timeout = timeout or Config.LATEX_TIMEOUT
+    preamble, body = split_preamble(latex_code)
+
+    pool = _pools.get(content_hash(preamble)) if body is not None else None
+    if pool:
+        worker = pool.acquire()
+        try:
+            # A warm worker only reads the body, so its log counts lines from \begin{document}
+            output = _run_passes(worker.workdir, lambda: worker.run(body, timeout),
+                                 pool.format_file, timeout, on_progress, preamble.count("\n"), keep_log)
+        finally:
+            worker.close()
+    else:
+        workdir = workspaces.acquire()
+        try:
+            (Path(workdir) / f"{JOB_NAME}.tex").write_text(latex_code, encoding='utf-8')
+            output = _run_passes(workdir, lambda: _run_pass(workdir, None, timeout),
+                                 None, timeout, on_progress, 0, keep_log)
+        finally:
+            workspaces.release(workdir)
+
+    output["warm"] = pool is not None
+    output["success"] = output["pdf"] is not None
+    output.pop("rerun_requested", None)
+    latex_log.metrics.record(output["diagnostics"], output["success"])
+    return output
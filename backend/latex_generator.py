@@ -3,370 +3,385 @@ LaTeX Resume Generator
 Generates professional LaTeX code from resume data using various templates.
 """
 
-def escape_latex(text: str) -> str:
-    """Escape special LaTeX characters."""
-    if not text:
-        return ""
-
-    replacements = {
-        '&': r'\&',
-        '%': r'\%',
-        '$': r'\$',
-        '#': r'\#',
-        '_': r'\_',
-        '{': r'\{',
-        '}': r'\}',
-        '~': r'\textasciitilde{}',
-        '^': r'\^{}',
-    }
-
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-
-    return text
-
-def generate_modern_deedy(resume_data: dict) -> str:
-    """Generate Modern Deedy style LaTeX resume."""
-
-    personal = resume_data.get("personal_info", {})
-    education = resume_data.get("education", [])
-    experience = resume_data.get("experience", [])
-    projects = resume_data.get("projects", [])
-    skills = resume_data.get("skills", [])
-    certifications = resume_data.get("certifications", [])
-
-    latex = r"""\documentclass[letterpaper,11pt]{article}
-
-\usepackage{latexsym}
-\usepackage[margin=0.5in]{geometry}
-\usepackage{titlesec}
-\usepackage{marvosym}
-\usepackage[usenames,dvipsnames]{color}
-\usepackage{verbatim}
-\usepackage{enumitem}
-\usepackage[hidelinks]{hyperref}
-\usepackage{fancyhdr}
-\usepackage[english]{babel}
-\usepackage{tabularx}
-
-\pagestyle{fancy}
-\fancyhf{}
-\fancyfoot{}
-\renewcommand{\headrulewidth}{0pt}
-\renewcommand{\footrulewidth}{0pt}
-
-\urlstyle{same}
-
-\raggedbottom
-\raggedright
-\setlength{\tabcolsep}{0in}
-
-\titleformat{\section}{
-  \vspace{-4pt}\scshape\raggedright\large
-}{}{0em}{}[\color{black}\titlerule \vspace{-5pt}]
-
-\newcommand{\resumeItem}[1]{
-  \item\small{
-    {#1 \vspace{-2pt}}
-  }
+import json
+import re
+from typing import Any, Callable, Dict, Iterator
+
+from backend.config import Config
+from backend.content_cache import ContentCache, content_hash
+from backend.template_manager import FIELD_SLOTS, SLOT, TemplatePlan, get_template_plan
+
+# Part of the /generate-latex ETag: bump whenever a change to the section
+# renderers or escaping changes the generated LaTeX, so clients holding an
+# old ETag get the new output instead of 304
+GENERATOR_VERSION = "1"
+
+# Every character with a special meaning in LaTeX text mode
+LATEX_ESCAPES = {
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\^{}',
 }
+_LATEX_SPECIAL = re.compile("[" + re.escape("".join(LATEX_ESCAPES)) + "]")
 
-\newcommand{\resumeSubheading}[4]{
-  \vspace{-1pt}\item
-    \begin{tabular*}{0.97\textwidth}[t]{l@{\extracolsep{\fill}}r}
-      \textbf{#1} & #2 \\
-      \textit{\small#3} & \textit{\small #4} \\
-    \end{tabular*}\vspace{-5pt}
-}
 
-\newcommand{\resumeProjectHeading}[2]{
-    \item
-    \begin{tabular*}{0.97\textwidth}{l@{\extracolsep{\fill}}r}
-      \small#1 & #2 \\
-    \end{tabular*}\vspace{-5pt}
-}
+def _escape_match(match: re.Match) -> str:
+    return LATEX_ESCAPES[match.group()]
 
-\renewcommand\labelitemii{$\vcenter{\hbox{\tiny$\bullet$}}$}
 
-\newcommand{\resumeSubHeadingListStart}{\begin{itemize}[leftmargin=0.15in, label={}]}
-\newcommand{\resumeSubHeadingListEnd}{\end{itemize}}
-\newcommand{\resumeItemListStart}{\begin{itemize}}
-\newcommand{\resumeItemListEnd}{\end{itemize}\vspace{-5pt}}
+def escape_latex(text: str) -> str:
+    """
+    Escape special LaTeX characters.
 
-\begin{document}
+    Each character is replaced in a single scan, so the braces and
+    backslashes of a replacement are never escaped again.
+    """
+    if not text:
+        return ""
+    return _LATEX_SPECIAL.sub(_escape_match, text)
 
-"""
 
-    # Header with name and contact
-    name = escape_latex(personal.get("name", "Your Name"))
-    latex += f"\\begin{{center}}\n"
-    latex += f"    \\textbf{{\\Huge \\scshape {name}}} \\\\ \\vspace{{1pt}}\n"
+def escape_resume_data(data: Any) -> Any:
+    """
+    Escape every string in a resume_data tree in one walk.
+
+    Args:
+        data: Resume data (nested dicts and lists)
 
-    # Contact info
+    Returns:
+        Copy of the tree with all strings escaped; None becomes an empty
+        string (as with escape_latex) and other values are kept as they are
+    """
+    if data is None:
+        return ""
+    if isinstance(data, str):
+        return _LATEX_SPECIAL.sub(_escape_match, data)
+    if isinstance(data, dict):
+        return {key: escape_resume_data(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [escape_resume_data(item) for item in data]
+    return data
+
+def _bullets(description: str) -> Iterator[str]:
+    """Split a description into bullet texts, dropping list markers."""
+    for bullet in description.strip().split('\n'):
+        bullet = bullet.strip().lstrip('•-* ')
+        if bullet:
+            yield bullet
+
+
+def _profile_link(url: str) -> str:
+    return url.replace("https://", "").replace("www.", "")
+
+
+# =====================================================
+# Section renderers
+# =====================================================
+# Each renderer gets the escaped resume data and the template plan and
+# yields the section content without a trailing line break; the template
+# decides on the spacing around it.
+
+def deedy_contact(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    personal = data.get("personal_info", {})
     contact_parts = []
     if personal.get("phone"):
-        contact_parts.append(escape_latex(personal["phone"]))
+        contact_parts.append(personal["phone"])
     if personal.get("email"):
-        contact_parts.append(f"\\href{{mailto:{escape_latex(personal['email'])}}}{{{escape_latex(personal['email'])}}}")
+        contact_parts.append(f"\\href{{mailto:{personal['email']}}}{{{personal['email']}}}")
     if personal.get("linkedin"):
-        linkedin_clean = personal["linkedin"].replace("https://", "").replace("www.", "")
-        contact_parts.append(f"\\href{{{escape_latex(personal['linkedin'])}}}{{\\underline{{{escape_latex(linkedin_clean)}}}}}")
+        contact_parts.append(f"\\href{{{personal['linkedin']}}}{{\\underline{{{_profile_link(personal['linkedin'])}}}}}")
     if personal.get("github"):
-        github_clean = personal["github"].replace("https://", "").replace("www.", "")
-        contact_parts.append(f"\\href{{{escape_latex(personal['github'])}}}{{\\underline{{{escape_latex(github_clean)}}}}}")
-
-    latex += f"    \\small {' $|$ '.join(contact_parts)}\n"
-    latex += "\\end{center}\n\n"
-
-    # Summary
-    if personal.get("summary"):
-        latex += "\\section{Professional Summary}\n"
-        latex += f"\\small{{{escape_latex(personal['summary'])}}}\n\n"
-
-    # Education
-    if education:
-        latex += "\\section{Education}\n"
-        latex += "  \\resumeSubHeadingListStart\n"
-        for edu in education:
-            degree = escape_latex(edu.get("degree", ""))
-            field = escape_latex(edu.get("field", ""))
-            institution = escape_latex(edu.get("institution", ""))
-            location = escape_latex(edu.get("location", ""))
-            graduation = escape_latex(edu.get("graduation", ""))
-
-            degree_field = f"{degree} in {field}" if field else degree
-            latex += f"    \\resumeSubheading\n"
-            latex += f"      {{{institution}}}{{{location}}}\n"
-            latex += f"      {{{degree_field}}}{{{graduation}}}\n"
-
-            if edu.get("gpa"):
-                latex += f"      \\resumeItemListStart\n"
-                latex += f"        \\resumeItem{{GPA: {escape_latex(edu['gpa'])}}}\n"
-                latex += f"      \\resumeItemListEnd\n"
-
-        latex += "  \\resumeSubHeadingListEnd\n\n"
-
-    # Experience
-    if experience:
-        latex += "\\section{Experience}\n"
-        latex += "  \\resumeSubHeadingListStart\n"
-        for exp in experience:
-            title = escape_latex(exp.get("title", ""))
-            company = escape_latex(exp.get("company", ""))
-            location = escape_latex(exp.get("location", ""))
-            date_range = f"{escape_latex(exp.get('start_date', ''))} - {escape_latex(exp.get('end_date', ''))}"
-
-            latex += f"    \\resumeSubheading\n"
-            latex += f"      {{{title}}}{{{date_range}}}\n"
-            latex += f"      {{{company}}}{{{location}}}\n"
-
-            if exp.get("description"):
-                latex += "      \\resumeItemListStart\n"
-                bullets = exp["description"].strip().split('\n')
-                for bullet in bullets:
-                    bullet = bullet.strip().lstrip('•-* ')
-                    if bullet:
-                        latex += f"        \\resumeItem{{{escape_latex(bullet)}}}\n"
-                latex += "      \\resumeItemListEnd\n"
-
-        latex += "  \\resumeSubHeadingListEnd\n\n"
-
-    # Projects
-    if projects:
-        latex += "\\section{Projects}\n"
-        latex += "    \\resumeSubHeadingListStart\n"
-        for proj in projects:
-            name = escape_latex(proj.get("name", ""))
-            tech = escape_latex(proj.get("technologies", ""))
-
-            # Add project links if available
-            links = []
-            if proj.get("github"):
-                links.append(f"\\href{{{escape_latex(proj['github'])}}}{{GitHub}}")
-            if proj.get("demo"):
-                links.append(f"\\href{{{escape_latex(proj['demo'])}}}{{Live Demo}}")
-
-            link_str = f" | {' | '.join(links)}" if links else ""
-
-            latex += f"      \\resumeProjectHeading\n"
-            latex += f"          {{\\textbf{{{name}}} $|$ \\emph{{{tech}}}{link_str}{{}}\n"
-
-            if proj.get("description"):
-                latex += "          \\resumeItemListStart\n"
-                latex += f"            \\resumeItem{{{escape_latex(proj['description'])}}}\n"
-                latex += "          \\resumeItemListEnd\n"
-
-        latex += "    \\resumeSubHeadingListEnd\n\n"
-
-    # Technical Skills
-    if skills:
-        latex += "\\section{Technical Skills}\n"
-        latex += " \\begin{itemize}[leftmargin=0.15in, label={}]\n"
-        latex += "    \\small{\\item{\n"
-
-        # Group skills
-        skills_str = ", ".join([escape_latex(skill) for skill in skills])
-        latex += f"     \\textbf{{Skills}}{{: {skills_str}}}\n"
-
-        latex += "    }}\n"
-        latex += " \\end{itemize}\n\n"
-
-    # Certifications
-    if certifications:
-        latex += "\\section{Certifications}\n"
-        latex += "  \\resumeSubHeadingListStart\n"
-        for cert in certifications:
-            name = escape_latex(cert.get("name", ""))
-            issuer = escape_latex(cert.get("issuer", ""))
-            date = escape_latex(cert.get("date", ""))
-
-            cert_line = f"{name} - {issuer}"
-            if cert.get("url"):
-                cert_line = f"\\href{{{escape_latex(cert['url'])}}}{{{cert_line}}}"
-
-            latex += f"    \\resumeSubheading{{{cert_line}}}{{{date}}}{{}}{{}} \n"
-
-        latex += "  \\resumeSubHeadingListEnd\n\n"
-
-    latex += "\\end{document}\n"
-
-    return latex
-
-def generate_tech_resume(resume_data: dict) -> str:
-    """Generate tech-focused LaTeX resume."""
-
-    personal = resume_data.get("personal_info", {})
-    education = resume_data.get("education", [])
-    experience = resume_data.get("experience", [])
-    projects = resume_data.get("projects", [])
-    skills = resume_data.get("skills", [])
-
-    latex = r"""\documentclass[letterpaper,11pt]{article}
-
-\usepackage[utf8]{inputenc}
-\usepackage[T1]{fontenc}
-\usepackage{geometry}
-\usepackage{hyperref}
-\usepackage{enumitem}
-\usepackage{titlesec}
-
-\geometry{left=0.75in,right=0.75in,top=0.75in,bottom=0.75in}
-
-\titleformat{\section}{\large\bfseries}{}{0em}{}[\titlerule]
-\titlespacing{\section}{0pt}{10pt}{5pt}
+        contact_parts.append(f"\\href{{{personal['github']}}}{{\\underline{{{_profile_link(personal['github'])}}}}}")
+    yield plan.contact_separator.join(contact_parts)
 
-\setlist[itemize]{leftmargin=*,noitemsep,topsep=0pt}
-
-\hypersetup{
-    colorlinks=true,
-    linkcolor=blue,
-    urlcolor=blue,
-}
 
-\begin{document}
+def deedy_education(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    yield "  \\resumeSubHeadingListStart\n"
+    for edu in data.get("education", []):
+        degree = edu.get("degree", "")
+        field = edu.get("field", "")
+        degree_field = f"{degree} in {field}" if field else degree
+
+        yield f"    \\resumeSubheading\n"
+        yield f"      {{{edu.get('institution', '')}}}{{{edu.get('location', '')}}}\n"
+        yield f"      {{{degree_field}}}{{{edu.get('graduation', '')}}}\n"
+
+        if edu.get("gpa"):
+            yield f"      \\resumeItemListStart\n"
+            yield f"        \\resumeItem{{GPA: {edu['gpa']}}}\n"
+            yield f"      \\resumeItemListEnd\n"
+    yield "  \\resumeSubHeadingListEnd"
+
+
+def deedy_experience(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    yield "  \\resumeSubHeadingListStart\n"
+    for exp in data.get("experience", []):
+        date_range = f"{exp.get('start_date', '')} - {exp.get('end_date', '')}"
+
+        yield f"    \\resumeSubheading\n"
+        yield f"      {{{exp.get('title', '')}}}{{{date_range}}}\n"
+        yield f"      {{{exp.get('company', '')}}}{{{exp.get('location', '')}}}\n"
+
+        if exp.get("description"):
+            yield "      \\resumeItemListStart\n"
+            for bullet in _bullets(exp["description"]):
+                yield f"        \\resumeItem{{{bullet}}}\n"
+            yield "      \\resumeItemListEnd\n"
+    yield "  \\resumeSubHeadingListEnd"
+
+
+def deedy_projects(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    yield "    \\resumeSubHeadingListStart\n"
+    for proj in data.get("projects", []):
+        # Add project links if available
+        links = []
+        if proj.get("github"):
+            links.append(f"\\href{{{proj['github']}}}{{GitHub}}")
+        if proj.get("demo"):
+            links.append(f"\\href{{{proj['demo']}}}{{Live Demo}}")
+
+        link_str = f" | {' | '.join(links)}" if links else ""
+
+        yield f"      \\resumeProjectHeading\n"
+        yield f"          {{\\textbf{{{proj.get('name', '')}}} $|$ \\emph{{{proj.get('technologies', '')}}}{link_str}}}{{}}\n"
+
+        if proj.get("description"):
+            yield "          \\resumeItemListStart\n"
+            yield f"            \\resumeItem{{{proj['description']}}}\n"
+            yield "          \\resumeItemListEnd\n"
+    yield "    \\resumeSubHeadingListEnd"
 
-\begin{center}
-"""
 
-    name = escape_latex(personal.get("name", "Your Name"))
-    latex += f"    {{\\LARGE \\textbf{{{name}}}}} \\\\\n"
-    latex += "    \\vspace{3pt}\n"
+def deedy_certifications(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    yield "  \\resumeSubHeadingListStart\n"
+    for cert in data.get("certifications", []):
+        cert_line = f"{cert.get('name', '')} - {cert.get('issuer', '')}"
+        if cert.get("url"):
+            cert_line = f"\\href{{{cert['url']}}}{{{cert_line}}}"
 
-    # Contact line
+        yield f"    \\resumeSubheading{{{cert_line}}}{{{cert.get('date', '')}}}{{}}{{}} \n"
+    yield "  \\resumeSubHeadingListEnd"
+
+
+def render_skills(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    yield ", ".join(data.get("skills", []))
+
+
+def plain_contact(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    personal = data.get("personal_info", {})
     contact = []
     if personal.get("email"):
-        contact.append(f"\\href{{mailto:{escape_latex(personal['email'])}}}{{{escape_latex(personal['email'])}}}")
+        contact.append(f"\\href{{mailto:{personal['email']}}}{{{personal['email']}}}")
     if personal.get("phone"):
-        contact.append(escape_latex(personal["phone"]))
+        contact.append(personal["phone"])
     if personal.get("github"):
-        contact.append(f"\\href{{{escape_latex(personal['github'])}}}{{GitHub}}")
+        contact.append(f"\\href{{{personal['github']}}}{{GitHub}}")
     if personal.get("linkedin"):
-        contact.append(f"\\href{{{escape_latex(personal['linkedin'])}}}{{LinkedIn}}")
+        contact.append(f"\\href{{{personal['linkedin']}}}{{LinkedIn}}")
     if personal.get("website"):
-        contact.append(f"\\href{{{escape_latex(personal['website'])}}}{{Portfolio}}")
-
-    latex += f"    {' $|$ '.join(contact)}\n"
-    latex += "\\end{center}\n\n"
-
-    # Technical Skills first (for tech resume)
-    if skills:
-        latex += "\\section*{Technical Skills}\n"
-        skills_str = ", ".join([escape_latex(s) for s in skills])
-        latex += f"{skills_str}\n\n"
-
-    # Experience
-    if experience:
-        latex += "\\section*{Experience}\n"
-        for exp in experience:
-            title = escape_latex(exp.get("title", ""))
-            company = escape_latex(exp.get("company", ""))
-            dates = f"{escape_latex(exp.get('start_date', ''))} - {escape_latex(exp.get('end_date', ''))}"
-
-            latex += f"\\textbf{{{title}}} \\hfill {dates} \\\\\n"
-            latex += f"\\textit{{{company}}} \\\\\n"
-
-            if exp.get("description"):
-                latex += "\\begin{itemize}\n"
-                bullets = exp["description"].strip().split('\n')
-                for bullet in bullets:
-                    bullet = bullet.strip().lstrip('•-* ')
-                    if bullet:
-                        latex += f"    \\item {escape_latex(bullet)}\n"
-                latex += "\\end{itemize}\n"
-            latex += "\\vspace{5pt}\n\n"
-
-    # Projects
-    if projects:
-        latex += "\\section*{Projects}\n"
-        for proj in projects:
-            name = escape_latex(proj.get("name", ""))
-            tech = escape_latex(proj.get("technologies", ""))
-
-            links = []
-            if proj.get("github"):
-                links.append(f"\\href{{{escape_latex(proj['github'])}}}{{GitHub}}")
-            if proj.get("demo"):
-                links.append(f"\\href{{{escape_latex(proj['demo'])}}}{{Demo}}")
-
-            link_str = f" | {' | '.join(links)}" if links else ""
-
-            latex += f"\\textbf{{{name}}} | {tech}{link_str} \\\\\n"
-            if proj.get("description"):
-                latex += f"{escape_latex(proj['description'])}\n"
-            latex += "\\vspace{5pt}\n\n"
-
-    # Education
-    if education:
-        latex += "\\section*{Education}\n"
-        for edu in education:
-            degree = escape_latex(edu.get("degree", ""))
-            field = escape_latex(edu.get("field", ""))
-            institution = escape_latex(edu.get("institution", ""))
-            graduation = escape_latex(edu.get("graduation", ""))
-
-            latex += f"\\textbf{{{degree}}} in {field} \\hfill {graduation} \\\\\n"
-            latex += f"{institution}"
-            if edu.get("gpa"):
-                latex += f" | GPA: {escape_latex(edu['gpa'])}"
-            latex += " \\\\\n\n"
-
-    latex += "\\end{document}\n"
-
-    return latex
+        contact.append(f"\\href{{{personal['website']}}}{{Portfolio}}")
+    yield plan.contact_separator.join(contact)
+
+
+def plain_experience(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    for index, exp in enumerate(data.get("experience", [])):
+        dates = f"{exp.get('start_date', '')} - {exp.get('end_date', '')}"
+
+        if index:
+            yield "\n\n"
+        yield f"\\textbf{{{exp.get('title', '')}}} \\hfill {dates} \\\\\n"
+        yield f"\\textit{{{exp.get('company', '')}}} \\\\\n"
+
+        if exp.get("description"):
+            yield "\\begin{itemize}\n"
+            for bullet in _bullets(exp["description"]):
+                yield f"    \\item {bullet}\n"
+            yield "\\end{itemize}\n"
+        yield "\\vspace{5pt}"
+
+
+def plain_projects(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    for index, proj in enumerate(data.get("projects", [])):
+        links = []
+        if proj.get("github"):
+            links.append(f"\\href{{{proj['github']}}}{{GitHub}}")
+        if proj.get("demo"):
+            links.append(f"\\href{{{proj['demo']}}}{{Demo}}")
+
+        link_str = f" | {' | '.join(links)}" if links else ""
+
+        if index:
+            yield "\n\n"
+        yield f"\\textbf{{{proj.get('name', '')}}} | {proj.get('technologies', '')}{link_str} \\\\\n"
+        if proj.get("description"):
+            yield f"{proj['description']}\n"
+        yield "\\vspace{5pt}"
+
+
+def plain_education(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    for index, edu in enumerate(data.get("education", [])):
+        if index:
+            yield "\n\n"
+        yield f"\\textbf{{{edu.get('degree', '')}}} in {edu.get('field', '')} \\hfill {edu.get('graduation', '')} \\\\\n"
+        yield f"{edu.get('institution', '')}"
+        if edu.get("gpa"):
+            yield f" | GPA: {edu['gpa']}"
+        yield " \\\\"
+
+
+def plain_certifications(data: dict, plan: TemplatePlan) -> Iterator[str]:
+    for index, cert in enumerate(data.get("certifications", [])):
+        cert_line = f"{cert.get('name', '')} - {cert.get('issuer', '')}"
+        if cert.get("url"):
+            cert_line = f"\\href{{{cert['url']}}}{{{cert_line}}}"
+
+        if index:
+            yield " \\\\\n"
+        yield f"{cert_line} \\hfill {cert.get('date', '')}"
+
+
+# Section renderers per template style
+SECTION_RENDERERS: Dict[str, Dict[str, Callable[[dict, TemplatePlan], Iterator[str]]]] = {
+    "deedy": {
+        "contact": deedy_contact,
+        "education": deedy_education,
+        "experience": deedy_experience,
+        "projects": deedy_projects,
+        "skills": render_skills,
+        "certifications": deedy_certifications,
+    },
+    "plain": {
+        "contact": plain_contact,
+        "education": plain_education,
+        "experience": plain_experience,
+        "projects": plain_projects,
+        "skills": render_skills,
+        "certifications": plain_certifications,
+    },
+}
+
+# Defaults for personal_info values that are missing
+FIELD_DEFAULTS = {"name": "Your Name"}
+
+# Resume data key each section is rendered from
+SECTION_SOURCES = {
+    "contact": "personal_info",
+    "education": "education",
+    "experience": "experience",
+    "projects": "projects",
+    "skills": "skills",
+    "certifications": "certifications",
+}
+
+# Rendered sections keyed by template, section and the section's data, so
+# regenerating after an edit only renders the sections that changed
+section_cache = ContentCache("latex_sections", max_memory_bytes=Config.SECTION_CACHE_MEMORY_MB * 1024 * 1024)
+
+
+def render_section(plan: TemplatePlan, slot: str, resume_data: dict) -> str:
+    """
+    Render one section of a template, reusing the cached fragment if its data is unchanged.
+
+    Args:
+        plan: Template plan
+        slot: Section slot (one of SECTION_SOURCES)
+        resume_data: Unescaped resume data
+
+    Returns:
+        Rendered LaTeX fragment
+    """
+    source = SECTION_SOURCES[slot]
+    section = resume_data.get(source)
+    key = content_hash(plan.digest, slot, json.dumps(section, sort_keys=True, default=str))
+
+    cached = section_cache.get(key)
+    if cached is not None:
+        return cached.decode("utf-8")
+
+    data = {source: escape_resume_data(section)} if section is not None else {}
+    fragment = "".join(SECTION_RENDERERS[plan.style][slot](data, plan))
+    section_cache.put(key, fragment.encode("utf-8"))
+    return fragment
+
+
+def _has_content(data: dict, slot: str) -> bool:
+    """Whether a block for the slot should be emitted (same answer for raw and escaped data)."""
+    if slot in FIELD_SLOTS:
+        return bool(data.get("personal_info", {}).get(slot))
+    if slot == "contact":
+        return bool(data.get("personal_info"))
+    return bool(data.get(slot))
+
+
+def _render_nodes(nodes: list, data: dict, plan: TemplatePlan) -> Iterator[str]:
+    for node in nodes:
+        if isinstance(node, str):
+            yield node
+        elif node[0] == SLOT:
+            slot = node[1]
+            if slot in SECTION_SOURCES:
+                yield render_section(plan, slot, data)
+            else:
+                yield str(escape_resume_data(data.get("personal_info", {}).get(slot, FIELD_DEFAULTS.get(slot, ""))))
+        elif _has_content(data, node[1]):
+            yield from _render_nodes(node[2], data, plan)
+
+
+def render_template(plan: TemplatePlan, resume_data: dict) -> Iterator[str]:
+    """
+    Fill a template's render plan with resume data.
+
+    Args:
+        plan: Parsed template from the template registry
+        resume_data: Unescaped resume data
+
+    Sections are escaped and rendered only when their data is not in the
+    section cache.
+
+    Yields:
+        LaTeX chunks of the complete document
+    """
+    yield plan.preamble
+    yield from _render_nodes(plan.body, resume_data, plan)
+
+
+def iter_latex_code(resume_data: dict, template_name: str, industry: str = "Technology") -> Iterator[str]:
+    """
+    Generate LaTeX code based on template as a sequence of chunks.
+    Unknown template names fall back to modern_deedy.
+    """
+    return render_template(get_template_plan(template_name), resume_data)
+
+
+def stream_latex_code(resume_data: dict, template_name: str, industry: str = "Technology",
+                      chunk_size: int = 16384) -> Iterator[str]:
+    """
+    Generate LaTeX code as response-sized chunks.
+
+    Small fragments are gathered in a list and joined once they reach
+    chunk_size characters, so a streamed response is sent in a few writes.
+    """
+    pending = []
+    size = 0
+    for fragment in iter_latex_code(resume_data, template_name, industry):
+        pending.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield "".join(pending)
+            pending.clear()
+            size = 0
+    if pending:
+        yield "".join(pending)
 
 def generate_latex_code(resume_data: dict, template_name: str, industry: str = "Technology") -> str:
     """
     Main function to generate LaTeX code based on template.
     """
-
-    if template_name == "tech_resume":
-        return generate_tech_resume(resume_data)
-    elif template_name in ["modern_deedy", "awesome_cv", "classic_altacv"]:
-        return generate_modern_deedy(resume_data)
-    elif template_name == "minimalist":
-        return generate_tech_resume(resume_data)  # Use tech resume for minimalist
-    elif template_name == "academic":
-        return generate_modern_deedy(resume_data)  # Can create academic variant
-    else:
-        # Default to modern_deedy
-        return generate_modern_deedy(resume_data)
\ No newline at end of file
+    return "".join(iter_latex_code(resume_data, template_name, industry))
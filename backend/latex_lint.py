@@ -0,0 +1,138 @@
+"""
+LaTeX Lint
+Fast pre-flight checks run on LaTeX sources before they reach pdflatex.
+
+A single regex scan over the source catches the mistakes that otherwise
+cost a full compile: unbalanced braces, mismatched \\begin/\\end pairs, a
+missing document environment, commands that touch the file system or the
+shell, and oversized input. Each problem is reported as a dictionary with
+its line, column, code and message.
+
+The command deny-list is a best-effort lint that gives early, readable
+feedback; it is not a safety control (\\csname input\\endcsname or
+\\@@input get past it). File access is enforced by the compiler itself:
+pdflatex runs without shell escape and with kpathsea's paranoid
+openin_any/openout_any settings (see latex_compiler).
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# Commands that read or write files, run programs or change how TeX reads input
+# (flagged for feedback only; the compiler sandbox is what blocks file access)
+DISALLOWED_COMMANDS = frozenset({
+    "write", "immediate", "openout", "openin", "closeout", "read", "readline",
+    "input", "include", "includeonly", "InputIfFileExists", "IfFileExists",
+    "verbatiminput", "lstinputlisting", "directlua", "latelua", "luaexec",
+    "ShellEscape", "pdfshellescape", "catcode", "endinput",
+})
+
+# Environments whose body is taken literally
+VERBATIM_ENVIRONMENTS = frozenset({"verbatim", "verbatim*", "lstlisting", "comment"})
+
+MAX_ISSUES = 20
+
+_TOKEN = re.compile(r"\\([A-Za-z@]+|.)|%[^\n]*|[{}]", re.DOTALL)
+_ENVIRONMENT_NAME = re.compile(r"\s*\{([^{}\\]*)\}")
+
+
+def _position(text: str, index: int) -> Dict[str, int]:
+    line_start = text.rfind("\n", 0, index) + 1
+    return {"line": text.count("\n", 0, index) + 1, "column": index - line_start + 1}
+
+
+def _issue(text: str, index: int, code: str, message: str) -> Dict:
+    return {**_position(text, index), "code": code, "message": message}
+
+
+def lint_latex(latex_code: str, max_bytes: Optional[int] = None) -> List[Dict]:
+    """
+    Check a LaTeX document for errors that make pdflatex fail, and for commands that touch files.
+
+    Args:
+        latex_code: Complete LaTeX document
+        max_bytes: Largest accepted source size in UTF-8 bytes (None = no limit)
+
+    Returns:
+        List of issues (line, column, code, message), empty when the source
+        passes; at most MAX_ISSUES are reported
+    """
+    if max_bytes is not None:
+        size = len(latex_code.encode("utf-8"))
+        if size > max_bytes:
+            # Too large to be worth scanning
+            return [{"line": 1, "column": 1, "code": "source-too-large",
+                     "message": f"LaTeX source is {size} bytes, the limit is {max_bytes}"}]
+
+    issues: List[Dict] = []
+    braces: List[int] = []
+    environments: List[tuple] = []
+    has_document = False
+    position = 0
+
+    while len(issues) < MAX_ISSUES:
+        match = _TOKEN.search(latex_code, position)
+        if match is None:
+            break
+        token, command = match.group(0), match.group(1)
+        position = match.end()
+
+        if token == "{":
+            braces.append(match.start())
+        elif token == "}":
+            if braces:
+                braces.pop()
+            else:
+                issues.append(_issue(latex_code, match.start(), "unmatched-brace", "Unmatched closing brace }"))
+        elif command is None:
+            continue  # comment
+        elif command in DISALLOWED_COMMANDS:
+            issues.append(_issue(latex_code, match.start(), "disallowed-command",
+                                 f"\\{command} is not allowed"))
+        elif command in ("begin", "end"):
+            name_match = _ENVIRONMENT_NAME.match(latex_code, position)
+            if name_match is None:
+                issues.append(_issue(latex_code, match.start(), "malformed-environment",
+                                     f"\\{command} must be followed by an environment name in braces"))
+                continue
+            name = name_match.group(1).strip()
+            position = name_match.end()
+
+            if command == "begin":
+                environments.append((name, match.start()))
+                if name == "document":
+                    has_document = True
+                if name in VERBATIM_ENVIRONMENTS:
+                    # Skip the literal body up to its \end
+                    end = latex_code.find(f"\\end{{{name}}}", position)
+                    position = len(latex_code) if end == -1 else end
+            elif not environments:
+                issues.append(_issue(latex_code, match.start(), "unmatched-end",
+                                     f"\\end{{{name}}} without a matching \\begin"))
+            else:
+                open_name, open_index = environments.pop()
+                if open_name != name:
+                    line = _position(latex_code, open_index)["line"]
+                    issues.append(_issue(latex_code, match.start(), "mismatched-environment",
+                                         f"\\end{{{name}}} closes \\begin{{{open_name}}} from line {line}"))
+            if name == "document" and command == "end":
+                break  # pdflatex ignores everything after \end{document}
+        elif command in ("verb", "lstinline"):
+            # \verb|...|: the next character delimits the literal text
+            if position < len(latex_code) and latex_code[position] == "*":
+                position += 1
+            if position < len(latex_code):
+                delimiter = latex_code[position]
+                end = latex_code.find("}" if delimiter == "{" else delimiter, position + 1)
+                position = len(latex_code) if end == -1 else end + 1
+
+    if len(issues) < MAX_ISSUES:
+        for name, index in reversed(environments):
+            issues.append(_issue(latex_code, index, "unclosed-environment", f"\\begin{{{name}}} is never closed"))
+        for index in braces[:MAX_ISSUES]:
+            issues.append(_issue(latex_code, index, "unclosed-brace", "Opening brace { is never closed"))
+        if not has_document:
+            issues.append({"line": 1, "column": 1, "code": "missing-document",
+                           "message": "No \\begin{document} found"})
+
+    return issues[:MAX_ISSUES]
@@ -0,0 +1,255 @@
+"""
+LaTeX Log Parser
+Turns a pdflatex log into structured diagnostics.
+
+The log is read line by line in a single pass with a small amount of
+state (the error waiting for its "l.<n>" location, the warning whose text
+wraps onto the next lines), so it can be fed straight from the open log
+file without reading it into memory.
+Each error gets the source line, an error class, the offending command
+and the message; LaTeX/package warnings and overfull/underfull boxes are
+collected alongside. Process-wide counters feed the /status endpoint.
+"""
+
+import io
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Union
+
+# Diagnostics kept per kind; the counts cover everything
+MAX_DIAGNOSTICS = 50
+# Continuation lines joined onto one warning
+MAX_WARNING_LINES = 6
+
+_ERROR = re.compile(r"^! (?P<message>.*)")
+_FILE_LINE_ERROR = re.compile(r"^(?:\./)?[^:\s]+\.tex:(?P<line>\d+): (?P<message>.*)")
+_LOCATION = re.compile(r"^l\.(?P<line>\d+) ?(?P<context>.*)")
+_BOX = re.compile(
+    r"^(?P<kind>Overfull|Underfull) \\(?P<box>[hv]box) \((?P<amount>[^)]*)\)"
+    r"(?:.*?lines? (?P<start>\d+)(?:--(?P<end>\d+))?)?"
+)
+_WARNING = re.compile(r"^(?P<source>LaTeX(?: \w+)?|Package \S+|Class \S+) Warning: (?P<message>.*)")
+_INPUT_LINE = re.compile(r"on input line (\d+)\.?$")
+_CONTROL_WORD = re.compile(r"\\(?:[A-Za-z@]+|.)")
+_AMOUNT = re.compile(r"([0-9.]+)pt")
+
+# First match wins
+ERROR_CLASSES = [
+    (re.compile(r"Undefined control sequence"), "undefined-command"),
+    (re.compile(r"Environment \S+ undefined"), "undefined-environment"),
+    (re.compile(r"\\begin\{[^}]*\} on input line \d+ ended by \\end"), "mismatched-environment"),
+    (re.compile(r"File `[^']*' not found"), "missing-file"),
+    (re.compile(r"Missing \$ inserted|Display math should end"), "math-mode"),
+    (re.compile(r"Missing [{}] inserted|Extra \}|Too many \}'s|Runaway argument|Paragraph ended before"),
+     "unbalanced-group"),
+    (re.compile(r"Extra alignment tab|Misplaced alignment tab"), "alignment"),
+    (re.compile(r"Missing \\begin\{document\}"), "missing-document"),
+    (re.compile(r"Missing number|Illegal unit"), "invalid-number"),
+    (re.compile(r"TeX capacity exceeded"), "capacity-exceeded"),
+    (re.compile(r"Emergency stop|Fatal error|job aborted"), "fatal"),
+    (re.compile(r"LaTeX Error"), "latex-error"),
+]
+
+
+def _starts_entry(line: str) -> bool:
+    """True for a line that opens a new error, box or warning (and so ends a wrapped warning)."""
+    return bool(_ERROR.match(line) or _FILE_LINE_ERROR.match(line) or _BOX.match(line) or _WARNING.match(line))
+
+
+def classify_error(message: str) -> str:
+    """Map a TeX error message to a short error class."""
+    for pattern, error_class in ERROR_CLASSES:
+        if pattern.search(message):
+            return error_class
+    return "tex-error"
+
+
+class LogParser:
+    """Incremental pdflatex log parser; feed lines, then read result()."""
+
+    def __init__(self, line_offset: int = 0):
+        """
+        Args:
+            line_offset: Added to every source line number (lines of the
+                preamble when only the document body was fed to pdflatex)
+        """
+        self.line_offset = line_offset
+        self.errors: List[Dict] = []
+        self.warnings: List[Dict] = []
+        self.boxes: List[Dict] = []
+        self.counts = Counter()
+        self._error: Optional[Dict] = None
+        self._warning: Optional[Dict] = None
+        self._warning_lines = 0
+
+    def _line(self, number: str) -> int:
+        return int(number) + self.line_offset
+
+    def _add(self, items: List[Dict], count_key: str, item: Dict) -> None:
+        self.counts[count_key] += 1
+        if len(items) < MAX_DIAGNOSTICS:
+            items.append(item)
+
+    def _start_error(self, message: str, line: Optional[int]) -> None:
+        message = message.strip()
+        self._error = {"line": line, "class": classify_error(message), "message": message,
+                       "command": None, "context": None}
+        self._add(self.errors, "errors", self._error)
+        self.counts[f"class:{self._error['class']}"] += 1
+
+    def _finish_warning(self) -> None:
+        match = _INPUT_LINE.search(self._warning["message"])
+        if match:
+            self._warning["line"] = self._line(match.group(1))
+        self._add(self.warnings, "warnings", self._warning)
+        self._warning = None
+
+    def feed(self, line: str) -> None:
+        """Consume one log line."""
+        line = line.rstrip("\r\n")
+
+        if self._warning is not None:
+            text = line.strip()
+            if text and self._warning_lines < MAX_WARNING_LINES and not _starts_entry(line):
+                # Package warnings indent their continuation lines with "(package)"
+                if text.startswith("(") and ")" in text:
+                    text = text[text.index(")") + 1:].strip()
+                self._warning["message"] += " " + text
+                self._warning_lines += 1
+                if _INPUT_LINE.search(self._warning["message"]):
+                    self._finish_warning()
+                return
+            self._finish_warning()
+            if not text:
+                return
+
+        match = _ERROR.match(line)
+        if match:
+            self._start_error(match.group("message"), None)
+            return
+
+        match = _FILE_LINE_ERROR.match(line)
+        if match:
+            self._start_error(match.group("message"), self._line(match.group("line")))
+            return
+
+        if self._error is not None:
+            match = _LOCATION.match(line)
+            if match:
+                context = match.group("context").strip()
+                commands = _CONTROL_WORD.findall(context)
+                if self._error["line"] is None:
+                    self._error["line"] = self._line(match.group("line"))
+                self._error["command"] = commands[-1] if commands else None
+                self._error["context"] = context
+                self._error = None
+                return
+
+        match = _BOX.match(line)
+        if match:
+            amount = _AMOUNT.search(match.group("amount"))
+            box = {
+                "box": match.group("box"),
+                "line": self._line(match.group("start")) if match.group("start") else None,
+                "end_line": self._line(match.group("end")) if match.group("end") else None,
+                "amount_pt": float(amount.group(1)) if amount else None,
+            }
+            if match.group("kind") == "Overfull":
+                self._add(self.boxes, "overfull_boxes", box)
+            else:
+                self.counts["underfull_boxes"] += 1
+            return
+
+        match = _WARNING.match(line)
+        if match:
+            self._warning = {
+                "line": None,
+                "source": match.group("source"),
+                "message": match.group("message").strip(),
+            }
+            self._warning_lines = 0
+            if _INPUT_LINE.search(self._warning["message"]):
+                self._finish_warning()
+
+    def result(self) -> Dict:
+        """
+        Returns:
+            Dictionary with errors, warnings, overfull_boxes (each capped at
+            MAX_DIAGNOSTICS) and the uncapped counts
+        """
+        if self._warning is not None:
+            self._finish_warning()
+
+        return {
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "overfull_boxes": self.boxes,
+            "counts": {
+                "errors": self.counts["errors"],
+                "warnings": self.counts["warnings"],
+                "overfull_boxes": self.counts["overfull_boxes"],
+                "underfull_boxes": self.counts["underfull_boxes"],
+            },
+            "error_classes": {
+                key.split(":", 1)[1]: value for key, value in self.counts.items() if key.startswith("class:")
+            },
+        }
+
+
+def parse_log(log: Union[str, Iterable[str]], line_offset: int = 0) -> Dict:
+    """
+    Parse a pdflatex log.
+
+    Args:
+        log: Log text or an iterable of lines (e.g. an open log file)
+        line_offset: Added to every source line number
+
+    Returns:
+        Diagnostics dictionary (see LogParser.result)
+    """
+    parser = LogParser(line_offset)
+    for line in io.StringIO(log) if isinstance(log, str) else log:
+        parser.feed(line)
+    return parser.result()
+
+
+def format_diagnostic(error: Dict) -> str:
+    """One-line summary of an error, e.g. "line 12: Undefined control sequence. (\\foo)"."""
+    location = f"line {error['line']}: " if error.get("line") else ""
+    command = f" ({error['command']})" if error.get("command") else ""
+    return f"{location}{error['message']}{command}"
+
+
+class LogMetrics:
+    """Thread-safe totals of the diagnostics seen by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._compiles = 0
+        self._failed = 0
+        self._counts = Counter()
+        self._error_classes = Counter()
+
+    def record(self, diagnostics: Dict, success: bool) -> None:
+        with self._lock:
+            self._compiles += 1
+            if not success:
+                self._failed += 1
+            self._counts.update(diagnostics["counts"])
+            self._error_classes.update(diagnostics["error_classes"])
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "compiles": self._compiles,
+                "failed": self._failed,
+                "errors": self._counts["errors"],
+                "warnings": self._counts["warnings"],
+                "overfull_boxes": self._counts["overfull_boxes"],
+                "underfull_boxes": self._counts["underfull_boxes"],
+                "error_classes": dict(self._error_classes),
+            }
+
+
+metrics = LogMetrics()
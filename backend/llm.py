@@ -1,6 +1,11 @@
 import os
+from typing import Callable, Optional
 from dotenv import load_dotenv
 
+from backend.config import Config
+from backend.content_cache import ContentCache, content_hash
+from backend.single_flight import SingleFlight
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -60,13 +65,81 @@ Guidelines:
 """
 
 
-def generate_with_ai ( prompt: str, max_tokens: int = 800 ) -> str :
+TEMPERATURE = 0.7
+
+# Completions keyed by everything that shapes them; kept on disk across restarts.
+# Only real completions are stored, never fallback or error messages.
+llm_cache = ContentCache(
+    "llm",
+    max_memory_bytes=Config.LLM_CACHE_MEMORY_MB * 1024 * 1024,
+    disk_dir=os.path.join( Config.CACHE_DIR, "llm" ),
+    max_disk_bytes=Config.LLM_CACHE_DISK_MB * 1024 * 1024,
+    ttl_seconds=Config.LLM_CACHE_TTL,
+)
+
+
+# Identical requests already waiting on the API share that one call
+llm_requests = SingleFlight( "llm" )
+
+
+def llm_cache_key ( prompt: str, max_tokens: int ) -> str :
+    """Cache key of a completion: model, system prompt, prompt, temperature and max_tokens."""
+    return content_hash( model_name, RESUME_SYSTEM_PROMPT, prompt, repr( TEMPERATURE ), str( max_tokens ) )
+
+
+def _complete ( prompt: str, max_tokens: int, cache_key: str, cache_if: Optional[Callable[[str], bool]] ) -> str :
+    """Call the API once and cache the completion if cache_if accepts it (raises on API errors)."""
+    response = client.chat.completions.create(
+        model=model_name,
+        messages=[
+            {"role" : "system", "content" : RESUME_SYSTEM_PROMPT},
+            {"role" : "user", "content" : prompt}
+        ],
+        temperature=TEMPERATURE,
+        max_tokens=max_tokens
+    )
+
+    text = response.choices[0].message.content.strip()
+    if Config.ENABLE_LLM_CACHE and text and (cache_if is None or cache_if( text )) :
+        llm_cache.put( cache_key, text.encode( "utf-8" ) )
+    return text
+
+
+def _cached ( cache_key: str ) :
+    if not Config.ENABLE_LLM_CACHE :
+        return None
+    cached = llm_cache.get( cache_key )
+    return cached.decode( "utf-8" ) if cached is not None else None
+
+
+def _error_message ( e: Exception ) -> str :
+    """User-facing text for a failed API call."""
+    print( f"❌ Error generating with AI: {e}" )
+
+    # Check for common errors
+    if "invalid_api_key" in str( e ) :
+        return "Invalid OpenAI API key. Please check your .env file and ensure OPENAI_API_KEY is correct."
+    elif "insufficient_quota" in str( e ) :
+        return "OpenAI API quota exceeded. Please check your OpenAI account billing."
+    elif "rate_limit" in str( e ) :
+        return "OpenAI API rate limit reached. Please try again in a moment."
+    else :
+        return f"Error generating AI response: {str( e )}"
+
+
+def generate_with_ai ( prompt: str, max_tokens: int = 800, cache_if: Optional[Callable[[str], bool]] = None ) -> str :
     """
     Generate text using OpenAI's GPT model.
 
+    Identical requests are answered from the LLM cache (memory, then disk)
+    without calling the API; identical requests arriving while one is
+    still waiting on the API share its response.
+
     Args:
         prompt: The prompt to send to the AI
         max_tokens: Maximum tokens in response
+        cache_if: Called with a completion before it is cached; completions
+            it rejects (e.g. replies that do not parse) are not cached
 
     Returns:
         Generated text as string
@@ -89,31 +162,15 @@ def generate_with_ai ( prompt: str, max_tokens: int = 800 ) -> str :
 
         return "OpenAI API key not configured. Please add OPENAI_API_KEY to your .env file to enable AI-powered features. For now, you can still use the app with basic functionality."
 
-    try :
-        response = client.chat.completions.create(
-            model=model_name,
-            messages=[
-                {"role" : "system", "content" : RESUME_SYSTEM_PROMPT},
-                {"role" : "user", "content" : prompt}
-            ],
-            temperature=0.7,
-            max_tokens=max_tokens
-        )
-
-        return response.choices[0].message.content.strip()
+    cache_key = llm_cache_key( prompt, max_tokens )
+    cached = _cached( cache_key )
+    if cached is not None :
+        return cached
 
+    try :
+        return llm_requests.do( cache_key, _complete, prompt, max_tokens, cache_key, cache_if )
     except Exception as e :
-        print( f"❌ Error generating with AI: {e}" )
-
-        # Check for common errors
-        if "invalid_api_key" in str( e ) :
-            return "Invalid OpenAI API key. Please check your .env file and ensure OPENAI_API_KEY is correct."
-        elif "insufficient_quota" in str( e ) :
-            return "OpenAI API quota exceeded. Please check your OpenAI account billing."
-        elif "rate_limit" in str( e ) :
-            return "OpenAI API rate limit reached. Please try again in a moment."
-        else :
-            return f"Error generating AI response: {str( e )}"
+        return _error_message( e )
 
 
 def check_api_status () -> dict :
@@ -1,17 +1,32 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
 from typing import List, Optional, Dict, Any
+import asyncio
+import itertools
+import json
+import os
 import subprocess
-import tempfile
-from pathlib import Path
 
-from backend.latex_generator import generate_latex_code
+from backend import (batch_compiler, compile_jobs, latex_compiler, latex_lint, latex_log, page_fit, pdf_optimizer,
+                     resume_extractor, thumbnails, upload_limits)
+from backend.bounded_scheduler import BoundedScheduler, QueueFull
+from backend.config import Config
+from backend.content_cache import ContentCache, content_hash
+from backend.latex_generator import GENERATOR_VERSION, generate_latex_code, section_cache, stream_latex_code
+from backend.llm import llm_cache, llm_requests
+from backend.template_manager import get_template_plan, list_templates, template_preambles
 from backend.resume_extractor import extract_from_pdf, extract_from_docx, extract_from_txt
 
 app = FastAPI(title="AI Resume Booster - LaTeX Edition", version="2.0")
 
+# Cap upload bodies while they stream in (before multipart parsing spools them)
+MAX_UPLOAD_BYTES = Config.MAX_UPLOAD_SIZE * 1024 * 1024
+app.add_middleware(upload_limits.UploadSizeLimitMiddleware, max_bytes=MAX_UPLOAD_BYTES, paths=["/extract-resume"])
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -19,9 +34,291 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+# Compress large JSON and LaTeX bodies for clients that accept gzip
+# (PDFs, PNGs and ZIPs are already compressed)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=Config.GZIP_MIN_SIZE,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/pdf",),
+)
+
+
+# CONDITIONAL REQUESTS
+def make_etag(*parts: str) -> str:
+    """Weak ETag from a content hash (weak, so it stays valid for gzip-encoded bodies)."""
+    return f'W/"{content_hash(*parts)[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+# PDF CACHE
+# Compiled PDFs keyed by a hash of the pdflatex version and the LaTeX source
+pdf_cache = ContentCache(
+    "pdf",
+    max_memory_bytes=Config.PDF_CACHE_MEMORY_MB * 1024 * 1024,
+    disk_dir=os.path.join(Config.CACHE_DIR, "pdf"),
+    max_disk_bytes=Config.PDF_CACHE_DISK_MB * 1024 * 1024,
 )
 
 
+# COMPILE SCHEDULER
+# Bounds concurrent pdflatex runs and the number of compiles waiting for a slot
+compile_scheduler = BoundedScheduler(Config.LATEX_MAX_PARALLEL, Config.LATEX_MAX_QUEUE, name="pdflatex")
+
+
+# EXTRACTION SCHEDULER
+# Resume parsing and the LLM call block; they run on their own bounded executor
+# (threads, so the extractors share this process's caches and LLM client)
+extraction_scheduler = BoundedScheduler(Config.EXTRACTION_WORKERS, Config.EXTRACTION_MAX_QUEUE, name="extraction")
+
+
+# Asynchronous compile jobs (submit, then poll or subscribe to events)
+job_store = compile_jobs.CompileJobStore(Config.COMPILE_JOB_MAX, Config.COMPILE_JOB_TTL)
+running_job_tasks = set()
+
+
+def compile_and_cache(latex_code: str, cache_key: str, on_progress=None) -> Dict[str, Any]:
+    """Compile LaTeX on a scheduler thread, optimize the PDF and store it in the cache."""
+    result = latex_compiler.compile_latex(latex_code, on_progress=on_progress)
+
+    if result["success"] and Config.ENABLE_PDF_OPTIMIZATION:
+        optimized = pdf_optimizer.optimize_pdf(result["pdf"])
+        result["pdf"], result["optimization"] = optimized["pdf"], optimized["report"]
+
+    if result["success"] and Config.ENABLE_PDF_CACHE:
+        pdf_cache.put(cache_key, result["pdf"])
+
+    return result
+
+
+def compile_and_preview(latex_code: str, cache_key: str, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    """Compile (and cache) LaTeX, then render page thumbnails in the same worker."""
+    result = compile_and_cache(latex_code, cache_key)
+
+    if result["success"]:
+        result["thumbnails"], result["thumbnail_cache"] = thumbnails.get_thumbnails(result["pdf"], max_pages=max_pages)
+
+    return result
+
+
+def render_gallery_item(resume_data: Dict[str, Any], template: str, industry: str) -> Dict[str, Any]:
+    """Generate one template, compile it (or reuse the cached PDF) and thumbnail its first page."""
+    latex_code = generate_latex_code(resume_data=resume_data, template_name=template, industry=industry)
+    cache_key = content_hash(latex_compiler.get_engine_version(), latex_code)
+
+    pdf = pdf_cache.get(cache_key) if Config.ENABLE_PDF_CACHE else None
+    cache_status = "HIT"
+    if pdf is None:
+        result = compile_and_cache(latex_code, cache_key)
+        if not result["success"]:
+            return {"template": template, "success": False, "error": "PDF compilation failed",
+                    "compile_errors": result["diagnostics"]["errors"]}
+        pdf, cache_status = result["pdf"], "MISS"
+
+    pages, _ = thumbnails.get_thumbnails(pdf, max_pages=1)
+    return {
+        "template": template,
+        "success": True,
+        "pdf_key": cache_key,
+        "pdf_url": f"/pdfs/{cache_key}",
+        "cache": cache_status,
+        "thumbnail": pages[0] if pages else None,
+    }
+
+
+async def compile_cached(latex_code: str) -> Dict[str, Any]:
+    """Compile on the scheduler unless the PDF is already cached (raises like compile_scheduler.run)."""
+    cache_key = content_hash(latex_compiler.get_engine_version(), latex_code)
+    cached_pdf = pdf_cache.get(cache_key) if Config.ENABLE_PDF_CACHE else None
+    if cached_pdf is not None:
+        return {"success": True, "pdf": cached_pdf, "passes": 0}
+    return await compile_scheduler.run(compile_and_cache, latex_code, cache_key)
+
+
+async def compile_fit_pdf(latex_code: str, fit_pages: int) -> Response:
+    """Compile layout variants in parallel and return the best one that fits fit_pages."""
+    cache_key = content_hash(latex_compiler.get_engine_version(), "fit", str(fit_pages), latex_code)
+    if Config.ENABLE_PDF_CACHE:
+        cached_pdf, cache_tier = pdf_cache.lookup(cache_key)
+        if cached_pdf is not None:
+            pages = page_fit.count_pages(cached_pdf)
+            return pdf_response(cached_pdf, cache_key, "HIT", cache_tier, extra_headers={
+                "X-Fit-Target": str(fit_pages),
+                "X-Fit-Pages": str(pages),
+                "X-Fit-Fits": str(pages <= fit_pages).lower(),
+            })
+
+    fit = await page_fit.fit_to_pages(latex_code, fit_pages, compile_cached, Config.PAGE_FIT_BUDGET)
+    print(f"Page fit: {fit['compiled']} variants compiled in {fit['elapsed']}s, "
+          f"chose {fit['variant']['name'] if fit['variant'] else 'none'} ({fit['pages']} pages)")
+
+    if fit["result"] is None:
+        errors = list(fit["errors"].values())
+        queue_full = [e for e in errors if isinstance(e, QueueFull)]
+        if queue_full:
+            raise HTTPException(
+                status_code=503,
+                detail="PDF compiler is busy. Please retry shortly.",
+                headers={"Retry-After": str(max(e.retry_after for e in queue_full))}
+            )
+        if any(isinstance(e, FileNotFoundError) for e in errors):
+            raise HTTPException(status_code=500, detail="pdflatex not found. Please install TeX Live or MiKTeX.")
+        if not errors:
+            raise HTTPException(status_code=500, detail="No layout variant compiled within the time budget")
+        original = fit["errors"].get(0)
+        if isinstance(original, page_fit.VariantFailed):
+            raise compile_failure(original.result)
+        raise HTTPException(status_code=500, detail="PDF compilation failed")
+
+    pdf = fit["result"]["pdf"]
+    if Config.ENABLE_PDF_CACHE:
+        pdf_cache.put(cache_key, pdf)
+
+    return pdf_response(pdf, cache_key, "MISS", passes=fit["result"]["passes"], extra_headers={
+        "X-Fit-Target": str(fit_pages),
+        "X-Fit-Pages": str(fit["pages"]),
+        "X-Fit-Fits": str(fit["fits"]).lower(),
+        "X-Fit-Variant": fit["variant"]["name"],
+        "X-Fit-Compiled": str(fit["compiled"]),
+        **optimization_headers(fit["result"].get("optimization")),
+    })
+
+
+def compile_failure(result: Dict[str, Any]) -> HTTPException:
+    """
+    Build the error for a failed compile.
+    Errors found in the pdflatex log are problems in the document (422, with
+    their line, class and command); without any, the failure is the server's (500).
+    """
+    diagnostics = result["diagnostics"]
+    print(f"PDF compilation failed with {diagnostics['counts']['errors']} error(s)")
+    for error in diagnostics["errors"][:5]:
+        print(f"   {latex_log.format_diagnostic(error)}")
+
+    if not diagnostics["errors"]:
+        print(f"Output: {result['stdout']}")
+        print(f"Error: {result['stderr']}")
+        return HTTPException(
+            status_code=500,
+            detail="PDF compilation failed. Make sure pdflatex is installed."
+        )
+
+    return HTTPException(
+        status_code=422,
+        detail={
+            "message": "PDF compilation failed",
+            "errors": diagnostics["errors"],
+            "overfull_boxes": diagnostics["overfull_boxes"],
+            "counts": diagnostics["counts"],
+        }
+    )
+
+
+def preflight(latex_code: str):
+    """Reject LaTeX that fails the lint with 422 and the list of issues, before it reaches pdflatex."""
+    if not Config.ENABLE_LATEX_LINT:
+        return
+
+    issues = latex_lint.lint_latex(latex_code, max_bytes=Config.LATEX_MAX_SOURCE_KB * 1024)
+    if issues:
+        print(f"LaTeX pre-flight check failed with {len(issues)} issue(s)")
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "LaTeX pre-flight check failed", "errors": issues}
+        )
+
+
+async def run_compile(func, *args) -> Dict[str, Any]:
+    """
+    Run a compile function on the scheduler and map failures to HTTP errors.
+    """
+    try:
+        result = await compile_scheduler.run(func, *args)
+    except QueueFull as e:
+        print(f"Compile queue full, rejecting request")
+        raise HTTPException(
+            status_code=503,
+            detail="PDF compiler is busy. Please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except subprocess.TimeoutExpired:
+        raise HTTPException(status_code=500, detail="PDF compilation timeout")
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=500,
+            detail="pdflatex not found. Please install TeX Live or MiKTeX."
+        )
+    except Exception as e:
+        print(f"Error compiling PDF: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not result["success"]:
+        raise compile_failure(result)
+
+    print(f"PDF compiled successfully in {result['passes']} pass(es){' (warm worker)' if result['warm'] else ''}")
+    return result
+
+
+def optimization_headers(report: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Size savings of the PDF optimizer as response headers (empty if the PDF was not optimized)."""
+    if not report:
+        return {}
+    return {
+        "X-PDF-Original-Size": str(report["original_size"]),
+        "X-PDF-Optimized-Size": str(report["optimized_size"]),
+        "X-PDF-Saved-Bytes": str(report["saved_bytes"]),
+        "X-PDF-Linearized": str(report["linearized"]).lower(),
+    }
+
+
+def pdf_response(pdf_content: bytes, cache_key: str, cache_status: str, cache_tier: Optional[str] = None,
+                 passes: Optional[int] = None, extra_headers: Optional[Dict[str, str]] = None) -> Response:
+    """Build the PDF download response with cache hit/miss and compile pass headers."""
+    headers = {
+        "Content-Disposition": "attachment; filename=resume.pdf",
+        "X-Cache": cache_status,
+        "X-Cache-Key": cache_key,
+    }
+    if cache_tier:
+        headers["X-Cache-Tier"] = cache_tier
+    if passes:
+        headers["X-Compile-Passes"] = str(passes)
+    if extra_headers:
+        headers.update(extra_headers)
+
+    return Response(content=pdf_content, media_type="application/pdf", headers=headers)
+
+
+# COMPILE ENGINE LIFECYCLE
+@app.on_event("startup")
+def start_compile_engine():
+    # Precompile the template preambles and start warm pdflatex workers
+    latex_compiler.warm_up_in_background(template_preambles())
+
+
+@app.on_event("shutdown")
+def stop_compile_engine():
+    compile_scheduler.shutdown()
+    extraction_scheduler.shutdown()
+    resume_extractor.shutdown()
+    batch_compiler.shutdown()
+    latex_compiler.shutdown()
+
+
 # REQUEST/RESPONSE MODELS
 class ResumeData(BaseModel):
     personal_info: Dict[str, str] = {}
@@ -37,10 +334,35 @@ class GenerateLaTeXRequest(BaseModel):
     resume_data: Dict[str, Any]
     template: str
     industry: str = "Technology"
+    stream: bool = False  # return the raw LaTeX as a chunked text response
 
 
 class CompilePDFRequest(BaseModel):
     latex_code: str
+    fit_pages: Optional[int] = Field(None, ge=1, le=10)  # shrink the layout until it fits N pages
+
+
+class CompileJobRequest(BaseModel):
+    # Unknown fields (such as fit_pages, which only /compile-pdf supports) are rejected
+    model_config = ConfigDict(extra="forbid")
+
+    latex_code: str
+
+
+class CompilePreviewRequest(BaseModel):
+    latex_code: str
+    max_pages: Optional[int] = None
+
+
+class RenderGalleryRequest(BaseModel):
+    resume_data: Dict[str, Any]
+    industry: str = "Technology"
+    templates: Optional[List[str]] = None  # defaults to every registered template
+
+
+class BatchCompileRequest(BaseModel):
+    items: List[GenerateLaTeXRequest]
+    mode: str = batch_compiler.PARALLEL  # or "single_run": one pdflatex run per template, split by page
 
 
 # HEALTH CHECK ENDPOINT
@@ -63,16 +385,46 @@ def health_check():
 
 # GENERATE LATEX ENDPOINT
 @app.post("/generate-latex")
-def generate_latex(request: GenerateLaTeXRequest):
+def generate_latex(request: GenerateLaTeXRequest, response: Response,
+                   if_none_match: Optional[str] = Header(None)):
     """
     Generate LaTeX code from resume data.
+    With "stream": true the LaTeX source is streamed as plain text while it
+    is generated instead of being wrapped in JSON.
+    The output is a pure function of the request, so its ETag is a hash of
+    the request, the template and the generator version; a matching
+    If-None-Match returns 304 without generating anything.
     """
+    etag = make_etag(app.version, GENERATOR_VERSION, get_template_plan(request.template).digest,
+                     json.dumps(request.model_dump(), sort_keys=True, default=str))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
     print(f"\n{'=' * 60}")
     print(f"Generating LaTeX Resume")
     print(f"Template: {request.template}")
     print(f"Industry: {request.industry}")
     print(f"{'=' * 60}")
 
+    if request.stream:
+        chunks = stream_latex_code(
+            resume_data=request.resume_data,
+            template_name=request.template,
+            industry=request.industry
+        )
+        # Generate the first chunk before the 200 is sent, so bad input still gets a 500 with detail
+        try:
+            first_chunk = next(chunks, "")
+        except Exception as e:
+            print(f"Error generating LaTeX: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        return StreamingResponse(
+            itertools.chain([first_chunk], chunks),
+            media_type="text/plain; charset=utf-8",
+            headers={"X-Template": request.template, "ETag": etag, "Cache-Control": "no-cache"}
+        )
+
     try:
         latex_code = generate_latex_code(
             resume_data=request.resume_data,
@@ -82,6 +434,8 @@ def generate_latex(request: GenerateLaTeXRequest):
 
         print(f"LaTeX code generated successfully ({len(latex_code)} characters)")
 
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
         return {
             "success": True,
             "latex_code": latex_code,
@@ -96,91 +450,330 @@ def generate_latex(request: GenerateLaTeXRequest):
 
 # COMPILE PDF ENDPOINT
 @app.post("/compile-pdf")
-def compile_pdf(request: CompilePDFRequest):
+async def compile_pdf(request: CompilePDFRequest):
     """
     Compile LaTeX code to PDF.
     Requires pdflatex to be installed on the system.
+    Identical sources are served from the PDF cache; the X-Cache response
+    header reports HIT or MISS. When the compile queue is full the request
+    is rejected with 503 and a Retry-After header.
+    With fit_pages set, tighter layout variants are compiled in parallel and
+    the least compact one that fits is returned (X-Fit-* headers).
+    Sources failing the LaTeX pre-flight check are rejected with 422 and a
+    list of errors (line, column, code, message) without running pdflatex.
     """
     print(f"\n{'=' * 60}")
     print(f"Compiling LaTeX to PDF")
     print(f"{'=' * 60}")
 
-    try:
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tex_file = Path(tmpdir) / "resume.tex"
-
-            # Write LaTeX code to file
-            tex_file.write_text(request.latex_code, encoding='utf-8')
-
-            # Compile with pdflatex
-            result = subprocess.run(
-                ['pdflatex', '-interaction=nonstopmode', '-output-directory', tmpdir, str(tex_file)],
-                capture_output=True,
-                text=True,
-                timeout=30
+    preflight(request.latex_code)
+
+    if request.fit_pages:
+        return await compile_fit_pdf(request.latex_code, request.fit_pages)
+
+    cache_key = content_hash(latex_compiler.get_engine_version(), request.latex_code)
+    if Config.ENABLE_PDF_CACHE:
+        cached_pdf, cache_tier = pdf_cache.lookup(cache_key)
+        if cached_pdf is not None:
+            print(f"PDF served from cache ({cache_tier})")
+            return pdf_response(cached_pdf, cache_key, "HIT", cache_tier)
+
+    result = await run_compile(compile_and_cache, request.latex_code, cache_key)
+    return pdf_response(result["pdf"], cache_key, "MISS", passes=result["passes"],
+                        extra_headers=optimization_headers(result.get("optimization")))
+
+
+# COMPILE PREVIEW ENDPOINTS
+@app.post("/compile-preview")
+async def compile_preview(request: CompilePreviewRequest):
+    """
+    Compile LaTeX code and return low-resolution PNG thumbnails of each page.
+    The PDF itself is kept in the PDF cache and can be downloaded from
+    GET /pdfs/{pdf_key}. Thumbnails are cached by the hash of the PDF.
+    """
+    print(f"\n{'=' * 60}")
+    print(f"Compiling LaTeX preview")
+    print(f"{'=' * 60}")
+
+    preflight(request.latex_code)
+
+    cache_key = content_hash(latex_compiler.get_engine_version(), request.latex_code)
+    cached_pdf = pdf_cache.get(cache_key) if Config.ENABLE_PDF_CACHE else None
+
+    if cached_pdf is not None:
+        try:
+            pages, thumbnail_cache = await compile_scheduler.run(
+                thumbnails.get_thumbnails, cached_pdf, None, request.max_pages
+            )
+        except QueueFull as e:
+            raise HTTPException(
+                status_code=503,
+                detail="PDF compiler is busy. Please retry shortly.",
+                headers={"Retry-After": str(e.retry_after)}
             )
+        result = {"pdf": cached_pdf, "thumbnails": pages, "thumbnail_cache": thumbnail_cache, "passes": 0}
+        cache_status = "HIT"
+    else:
+        result = await run_compile(compile_and_preview, request.latex_code, cache_key, request.max_pages)
+        cache_status = "MISS"
+
+    return {
+        "success": True,
+        "pdf_key": cache_key,
+        "pdf_url": f"/pdfs/{cache_key}",
+        "pdf_size": len(result["pdf"]),
+        "pdf_optimization": result.get("optimization"),
+        "cache": cache_status,
+        "passes": result["passes"],
+        "pages": result["thumbnails"],
+        "thumbnail_cache": result["thumbnail_cache"],
+    }
 
-            pdf_file = Path(tmpdir) / "resume.pdf"
-
-            if pdf_file.exists():
-                print(f"PDF compiled successfully")
-                pdf_content = pdf_file.read_bytes()
-
-                return Response(
-                    content=pdf_content,
-                    media_type="application/pdf",
-                    headers={
-                        "Content-Disposition": "attachment; filename=resume.pdf"
-                    }
-                )
-            else:
-                print(f"PDF compilation failed")
-                print(f"Output: {result.stdout}")
-                print(f"Error: {result.stderr}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="PDF compilation failed. Make sure pdflatex is installed."
-                )
 
+# TEMPLATE GALLERY ENDPOINT
+@app.post("/render-gallery")
+async def render_gallery(request: RenderGalleryRequest):
+    """
+    Render the same resume in every template at once.
+    All templates are generated and compiled concurrently on the compile
+    scheduler; each entry has a first-page thumbnail and a handle for
+    GET /pdfs/{pdf_key}.
+    """
+    templates = request.templates or list_templates()
+    unknown = [name for name in templates if name not in list_templates()]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown templates: {', '.join(unknown)}")
+
+    print(f"\n{'=' * 60}")
+    print(f"Rendering template gallery ({len(templates)} templates)")
+    print(f"{'=' * 60}")
+
+    async def render(template: str) -> Dict[str, Any]:
+        try:
+            return await compile_scheduler.run(render_gallery_item, request.resume_data, template, request.industry)
+        except QueueFull as e:
+            return {"template": template, "success": False, "error": "PDF compiler is busy", "retry_after": e.retry_after}
+        except subprocess.TimeoutExpired:
+            return {"template": template, "success": False, "error": "PDF compilation timeout"}
+        except FileNotFoundError:
+            return {"template": template, "success": False, "error": "pdflatex not found"}
+        except Exception as e:
+            print(f"Error rendering {template}: {e}")
+            return {"template": template, "success": False, "error": str(e)}
+
+    items = await asyncio.gather(*(render(template) for template in templates))
+
+    # Nothing rendered because the queue was full: let the client back off
+    if not any(item["success"] for item in items) and any("retry_after" in item for item in items):
+        raise HTTPException(
+            status_code=503,
+            detail="PDF compiler is busy. Please retry shortly.",
+            headers={"Retry-After": str(max(item.get("retry_after", 1) for item in items))}
+        )
+
+    return {
+        "success": any(item["success"] for item in items),
+        "templates": items,
+    }
+
+
+@app.get("/pdfs/{pdf_key}")
+def get_cached_pdf(pdf_key: str):
+    """
+    Download a previously compiled PDF by its cache key.
+    """
+    pdf_content, cache_tier = pdf_cache.lookup(pdf_key)
+    if pdf_content is None:
+        raise HTTPException(status_code=404, detail="PDF not found or expired from cache")
+
+    return pdf_response(pdf_content, pdf_key, "HIT", cache_tier)
+
+
+# COMPILE JOB ENDPOINTS
+async def run_compile_job(job: compile_jobs.CompileJob):
+    """Run a submitted job on the compile scheduler and record its outcome."""
+    def on_progress(pass_number: int):
+        job_store.update(job, state=compile_jobs.RUNNING, pass_number=pass_number)
+
+    try:
+        result = await compile_scheduler.run(compile_and_cache, job.latex_code, job.cache_key, on_progress)
+    except QueueFull:
+        job_store.update(job, state=compile_jobs.FAILED, error="PDF compiler is busy. Please resubmit shortly.")
     except subprocess.TimeoutExpired:
-        raise HTTPException(status_code=500, detail="PDF compilation timeout")
+        job_store.update(job, state=compile_jobs.FAILED, error="PDF compilation timeout")
     except FileNotFoundError:
+        job_store.update(job, state=compile_jobs.FAILED, error="pdflatex not found. Please install TeX Live or MiKTeX.")
+    except Exception as e:
+        print(f"Error in compile job {job.id}: {e}")
+        job_store.update(job, state=compile_jobs.FAILED, error=str(e))
+    else:
+        if result["success"]:
+            job_store.update(job, state=compile_jobs.DONE, pdf=result["pdf"], cache_status="MISS")
+        else:
+            errors = result["diagnostics"]["errors"]
+            error = "PDF compilation failed"
+            if errors:
+                error += f": {latex_log.format_diagnostic(errors[0])}"
+            job_store.update(job, state=compile_jobs.FAILED, error=error, compile_errors=errors)
+
+
+def get_job_or_404(job_id: str) -> compile_jobs.CompileJob:
+    job = job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Compile job not found")
+    return job
+
+
+@app.post("/compile-jobs", status_code=202)
+async def submit_compile_job(request: CompileJobRequest):
+    """
+    Submit LaTeX code for compilation and return a job id immediately.
+    Poll GET /compile-jobs/{job_id} or stream GET /compile-jobs/{job_id}/events,
+    then download the result from GET /compile-jobs/{job_id}/pdf.
+    """
+    preflight(request.latex_code)
+
+    cache_key = content_hash(latex_compiler.get_engine_version(), request.latex_code)
+    cached_pdf = pdf_cache.get(cache_key) if Config.ENABLE_PDF_CACHE else None
+
+    if cached_pdf is None and compile_scheduler.is_full():
         raise HTTPException(
-            status_code=500,
-            detail="pdflatex not found. Please install TeX Live or MiKTeX."
+            status_code=503,
+            detail="PDF compiler is busy. Please retry shortly.",
+            headers={"Retry-After": str(compile_scheduler.retry_after())}
         )
-    except Exception as e:
-        print(f"Error compiling PDF: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+
+    job = job_store.create(request.latex_code, cache_key)
+    if cached_pdf is not None:
+        job_store.update(job, state=compile_jobs.DONE, pdf=cached_pdf, cache_status="HIT")
+    else:
+        task = asyncio.create_task(run_compile_job(job))
+        running_job_tasks.add(task)
+        task.add_done_callback(running_job_tasks.discard)
+
+    return job.to_dict()
+
+
+@app.get("/compile-jobs/{job_id}")
+def get_compile_job(job_id: str):
+    """
+    Get the current state of a compile job.
+    """
+    return get_job_or_404(job_id).to_dict()
+
+
+@app.get("/compile-jobs/{job_id}/events")
+async def stream_compile_job(job_id: str):
+    """
+    Stream compile job state changes as server-sent events until it finishes.
+    """
+    job = get_job_or_404(job_id)
+    return StreamingResponse(
+        job_store.events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/compile-jobs/{job_id}/pdf")
+def get_compile_job_pdf(job_id: str):
+    """
+    Download the PDF of a finished compile job.
+    """
+    job = get_job_or_404(job_id)
+    if job.state == compile_jobs.FAILED:
+        raise HTTPException(status_code=422, detail=job.error or "PDF compilation failed")
+    if job.state != compile_jobs.DONE:
+        raise HTTPException(status_code=409, detail=f"Compile job is {job.state}")
+
+    return pdf_response(job.pdf, job.cache_key, job.cache_status, passes=job.pass_number or None)
+
+
+# BATCH COMPILE ENDPOINT
+@app.post("/batch/compile")
+async def batch_compile(request: BatchCompileRequest):
+    """
+    Generate and compile many resumes in parallel.
+    Streams back a ZIP archive that grows as items finish, with one PDF (or
+    error file) per item and a final status.json describing every item.
+    With mode "single_run", resumes sharing a template are compiled together
+    in one pdflatex run and split into per-resume PDFs.
+    Batch compiles share the pdflatex slots of the compile scheduler (after
+    interactive compiles); when the unfinished items of all batches would
+    exceed BATCH_MAX_PENDING the batch is rejected with 503 and Retry-After.
+    """
+    if request.mode not in batch_compiler.BATCH_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown batch mode: {request.mode}")
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch contains no items")
+    if len(request.items) > Config.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large ({len(request.items)} items, maximum {Config.BATCH_MAX_ITEMS})"
+        )
+
+    if not batch_compiler.backlog.reserve(len(request.items)):
+        raise HTTPException(
+            status_code=503,
+            detail="Batch compiler is busy. Please retry shortly.",
+            headers={"Retry-After": str(compile_scheduler.retry_after(batch_compiler.backlog.pending))}
+        )
+
+    print(f"\n{'=' * 60}")
+    print(f"Batch compiling {len(request.items)} resumes ({request.mode})")
+    print(f"{'=' * 60}")
+
+    items = [item.model_dump() for item in request.items]
+    if request.mode == batch_compiler.SINGLE_RUN:
+        results = batch_compiler.run_single_run(items, compile_scheduler)
+    else:
+        results = batch_compiler.run_parallel(items, compile_scheduler)
+
+    return StreamingResponse(
+        batch_compiler.stream_zip(results),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=resumes.zip"}
+    )
 
 
 # EXTRACT RESUME ENDPOINT
+RESUME_EXTRACTORS = {
+    ".pdf": extract_from_pdf,
+    ".docx": extract_from_docx,
+    ".txt": extract_from_txt,
+}
+
+
 @app.post("/extract-resume")
 async def extract_resume(file: UploadFile = File(...)):
     """
     Extract information from uploaded resume.
+    Parsing and the AI call run on the extraction executor, so the event
+    loop keeps serving other requests; when all extraction workers are busy
+    and the wait queue is full the upload is rejected with 503 and Retry-After.
+    The upload is spooled to a temporary file while it streams in and the
+    parsers read from that file; bodies over MAX_UPLOAD_SIZE are cut off
+    with 413 by the upload limit middleware.
     """
     print(f"\n{'=' * 60}")
     print(f"Extracting resume from: {file.filename}")
     print(f"{'=' * 60}")
 
+    # Determine file type
+    extension = os.path.splitext((file.filename or "").lower())[1]
+    extractor = RESUME_EXTRACTORS.get(extension)
+    if extension not in Config.ALLOWED_RESUME_EXTENSIONS or extractor is None:
+        allowed = ", ".join(ext for ext in Config.ALLOWED_RESUME_EXTENSIONS if ext in RESUME_EXTRACTORS)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Please upload one of: {allowed}."
+        )
+
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise upload_limits.too_large(MAX_UPLOAD_BYTES)
+
     try:
-        # Read file content
-        content = await file.read()
-
-        # Determine file type and extract
-        if file.filename.endswith('.pdf'):
-            resume_data = extract_from_pdf(content)
-        elif file.filename.endswith('.docx'):
-            resume_data = extract_from_docx(content)
-        elif file.filename.endswith('.txt'):
-            resume_data = extract_from_txt(content)
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Unsupported file type. Please upload PDF, DOCX, or TXT."
-            )
+        resume_data = await extraction_scheduler.run(extractor, file.file)
 
         print(f"Resume extracted successfully")
 
@@ -190,59 +783,85 @@ async def extract_resume(file: UploadFile = File(...)):
             "message": "Resume information extracted successfully"
         }
 
+    except QueueFull as e:
+        print(f"Extraction queue full, rejecting upload")
+        raise HTTPException(
+            status_code=503,
+            detail="Resume extraction is busy. Please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         print(f"Error extracting resume: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # GET AVAILABLE TEMPLATES ENDPOINT
+TEMPLATE_INFO = {
+    "modern_deedy": {
+        "name": "Modern Deedy",
+        "description": "Single column, modern design",
+        "best_for": "Software Engineers, Designers"
+    },
+    "awesome_cv": {
+        "name": "Awesome CV",
+        "description": "Professional two-column layout",
+        "best_for": "Experienced Professionals"
+    },
+    "classic_altacv": {
+        "name": "Classic AltaCV",
+        "description": "Two column with sidebar",
+        "best_for": "Creative Professionals"
+    },
+    "academic": {
+        "name": "Academic CV",
+        "description": "Traditional academic format",
+        "best_for": "Researchers, Academics"
+    },
+    "tech_resume": {
+        "name": "Tech Resume",
+        "description": "Developer-focused layout",
+        "best_for": "Software Developers"
+    },
+    "minimalist": {
+        "name": "Minimalist",
+        "description": "Clean and simple design",
+        "best_for": "All Industries"
+    }
+}
+
+# The list is static, so its body and ETag are built once
+TEMPLATES_BODY = json.dumps({"templates": TEMPLATE_INFO}).encode("utf-8")
+TEMPLATES_ETAG = make_etag(TEMPLATES_BODY.decode("utf-8"))
+TEMPLATES_CACHE_CONTROL = "public, max-age=3600"
+
+
 @app.get("/templates")
-def get_templates():
+def get_templates(if_none_match: Optional[str] = Header(None)):
     """
     Get list of available LaTeX templates.
     """
-    return {
-        "templates": {
-            "modern_deedy": {
-                "name": "Modern Deedy",
-                "description": "Single column, modern design",
-                "best_for": "Software Engineers, Designers"
-            },
-            "awesome_cv": {
-                "name": "Awesome CV",
-                "description": "Professional two-column layout",
-                "best_for": "Experienced Professionals"
-            },
-            "classic_altacv": {
-                "name": "Classic AltaCV",
-                "description": "Two column with sidebar",
-                "best_for": "Creative Professionals"
-            },
-            "academic": {
-                "name": "Academic CV",
-                "description": "Traditional academic format",
-                "best_for": "Researchers, Academics"
-            },
-            "tech_resume": {
-                "name": "Tech Resume",
-                "description": "Developer-focused layout",
-                "best_for": "Software Developers"
-            },
-            "minimalist": {
-                "name": "Minimalist",
-                "description": "Clean and simple design",
-                "best_for": "All Industries"
-            }
-        }
-    }
+    if etag_matches(if_none_match, TEMPLATES_ETAG):
+        return not_modified(TEMPLATES_ETAG, TEMPLATES_CACHE_CONTROL)
+
+    return Response(
+        content=TEMPLATES_BODY,
+        media_type="application/json",
+        headers={"ETag": TEMPLATES_ETAG, "Cache-Control": TEMPLATES_CACHE_CONTROL}
+    )
 
 
 # VALIDATE RESUME DATA ENDPOINT
 @app.post("/validate-resume")
-def validate_resume(resume_data: ResumeData):
+def validate_resume(resume_data: ResumeData, template: Optional[str] = None, industry: str = "Technology"):
     """
     Validate resume data and provide feedback.
+    With the template query parameter the resume is also generated in that
+    template and the LaTeX is run through the pre-flight check, so problems
+    surface before a compile is requested.
     """
+    if template is not None and template not in list_templates():
+        raise HTTPException(status_code=400, detail=f"Unknown template: {template}")
+
     issues = []
     warnings = []
 
@@ -274,11 +893,29 @@ def validate_resume(resume_data: ResumeData):
     if not has_links:
         warnings.append("Consider adding GitHub, LinkedIn, or portfolio links")
 
+    validation = {}
+    if template is not None:
+        latex_code = generate_latex_code(
+            resume_data=resume_data.model_dump(),
+            template_name=template,
+            industry=industry
+        )
+        latex_errors = latex_lint.lint_latex(latex_code, max_bytes=Config.LATEX_MAX_SOURCE_KB * 1024)
+        for error in latex_errors:
+            issues.append(f"LaTeX line {error['line']}: {error['message']}")
+        validation["latex"] = {
+            "template": template,
+            "valid": len(latex_errors) == 0,
+            "size": len(latex_code.encode("utf-8")),
+            "errors": latex_errors,
+        }
+
     return {
         "valid": len(issues) == 0,
         "issues": issues,
         "warnings": warnings,
-        "score": max(0, 100 - len(issues) * 20 - len(warnings) * 5)
+        "score": max(0, 100 - len(issues) * 20 - len(warnings) * 5),
+        **validation
     }
 
 
@@ -301,6 +938,17 @@ def get_status():
         "latex_generation": "enabled",
         "pdf_compilation": "enabled" if pdflatex_available else "disabled",
         "resume_extraction": "enabled",
+        "pdf_cache": pdf_cache.stats(),
+        "compile_queue": compile_scheduler.stats(),
+        "batch_backlog": batch_compiler.backlog.stats(),
+        "extraction_queue": extraction_scheduler.stats(),
+        "compile_workspaces": latex_compiler.workspaces.stats(),
+        "thumbnail_cache": thumbnails.thumbnail_cache.stats(),
+        "section_cache": section_cache.stats(),
+        "llm_cache": llm_cache.stats(),
+        "llm_in_flight": llm_requests.stats(),
+        "compile_diagnostics": latex_log.metrics.stats(),
+        "pdf_optimization": pdf_optimizer.stats.stats(),
         "message": "All systems operational" if pdflatex_available else "PDF compilation requires pdflatex installation"
     }
 
@@ -0,0 +1,245 @@
+"""
+Page Fit
+Searches layout variants of a LaTeX resume for one that fits a page limit.
+
+Each variant tightens margins, font size and list spacing a little more
+than the previous one. The overrides are inserted right after
+\\begin{document}, so the preamble (and its precompiled format) stays
+untouched and every override is skipped when the package it needs is not
+loaded. Margin and font steps only ever shrink the document's own
+margins and base font size, so a template that is already tighter than
+a step skips it. Variants are
+compiled concurrently; the least aggressive variant that fits wins.
+"""
+
+import asyncio
+import io
+import re
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from backend.latex_compiler import BEGIN_DOCUMENT
+
+# Ordered from untouched to most compact
+LAYOUT_VARIANTS: List[Dict] = [
+    {"name": "original", "margin": None, "font": None, "spacing": None},
+    {"name": "compact-spacing", "margin": None, "font": None, "spacing": "compact"},
+    {"name": "margins-0.6in", "margin": 0.6, "font": None, "spacing": "compact"},
+    {"name": "margins-0.5in-10pt", "margin": 0.5, "font": 10, "spacing": "compact"},
+    {"name": "margins-0.5in-10pt-tight", "margin": 0.5, "font": 10, "spacing": "tight"},
+    {"name": "margins-0.4in-9pt-tight", "margin": 0.4, "font": 9, "spacing": "tight"},
+    {"name": "margins-0.3in-9pt-tight", "margin": 0.3, "font": 9, "spacing": "tight"},
+]
+
+# Inches per unit of a geometry length
+LENGTH_UNITS = {"in": 1.0, "cm": 1 / 2.54, "mm": 1 / 25.4, "pt": 1 / 72.27}
+
+_DOCUMENT_CLASS_SIZE = re.compile(r"\\documentclass\[[^\]]*?\b(\d+(?:\.\d+)?)pt\b[^\]]*\]")
+_GEOMETRY_MARGIN = re.compile(r"\b(?:margin|left|right|hmargin|lmargin|rmargin)\s*=\s*([0-9.]+)\s*(in|cm|mm|pt)\b")
+
+LIST_SPACING = {
+    "compact": r"itemsep=1pt,parsep=0pt,topsep=2pt",
+    "tight": r"itemsep=0pt,parsep=0pt,topsep=0pt,partopsep=0pt",
+}
+
+
+class VariantFailed(RuntimeError):
+    """A layout variant compiled without producing a PDF."""
+
+    def __init__(self, variant: Dict, result: Dict):
+        super().__init__(f"variant {variant['name']} failed to compile")
+        self.result = result
+
+
+def variant_name(variant: Dict) -> str:
+    """Name of a variant from its settings, e.g. "margins-0.5in-10pt-tight"."""
+    parts = []
+    if variant["margin"] is not None:
+        parts.append(f"margins-{variant['margin']}in")
+    if variant["font"] is not None:
+        parts.append(f"{variant['font']}pt")
+    if not parts:
+        return f"{variant['spacing']}-spacing" if variant["spacing"] else "original"
+    if variant["spacing"] == "tight":
+        parts.append("tight")
+    return "-".join(parts)
+
+
+def document_margin(latex_code: str) -> Optional[float]:
+    """
+    Smallest horizontal geometry margin set in the preamble, in inches.
+
+    Returns:
+        Margin in inches, or None if the preamble sets none that can be read
+    """
+    index = latex_code.find(BEGIN_DOCUMENT)
+    preamble = latex_code[:index] if index != -1 else latex_code
+    margins = [float(value) * LENGTH_UNITS[unit] for value, unit in _GEOMETRY_MARGIN.findall(preamble)
+               if value.replace(".", "", 1).isdigit()]
+    return min(margins) if margins else None
+
+
+def document_font_size(latex_code: str) -> Optional[float]:
+    """Base font size from the \\documentclass options in points, or None if it sets none."""
+    match = _DOCUMENT_CLASS_SIZE.search(latex_code)
+    return float(match.group(1)) if match else None
+
+
+def variants_for(latex_code: str) -> List[Dict]:
+    """
+    Layout variants that make sense for a document, from least to most compact.
+
+    Margin and font steps that are not smaller than the document's own
+    margin and font size are dropped from their variant, and variants left
+    identical to a less aggressive one are skipped, so every variant
+    compiled is tighter than the one before it.
+    """
+    margin = document_margin(latex_code)
+    font = document_font_size(latex_code)
+    variants: List[Dict] = []
+    seen = set()
+    for variant in LAYOUT_VARIANTS:
+        if variant["margin"] is not None and margin is not None and variant["margin"] >= margin:
+            variant = {**variant, "margin": None}
+        if variant["font"] is not None and font is not None and variant["font"] >= font:
+            variant = {**variant, "font": None}
+        variant = {**variant, "name": variant_name(variant)}
+        settings = (variant["margin"], variant["font"], variant["spacing"])
+        if settings not in seen:
+            seen.add(settings)
+            variants.append(variant)
+    return variants
+
+
+def layout_overrides(variant: Dict) -> str:
+    """LaTeX placed after \\begin{document} to apply a layout variant."""
+    lines = []
+    if variant["margin"] is not None:
+        # Only when it widens the text block; margins already tighter are kept
+        lines.append(
+            f"\\ifdefined\\newgeometry\\ifdim\\textwidth<\\dimexpr\\paperwidth-{2 * variant['margin']:g}in\\relax"
+            f"\\newgeometry{{margin={variant['margin']}in}}\\fi\\fi"
+        )
+    if variant["font"] is not None:
+        size = variant["font"]
+        lines.append(f"\\renewcommand{{\\normalsize}}{{\\fontsize{{{size}}}{{{size * 1.2:g}}}\\selectfont}}")
+        lines.append(f"\\renewcommand{{\\small}}{{\\fontsize{{{size - 1}}}{{{(size - 1) * 1.2:g}}}\\selectfont}}")
+        lines.append("\\normalsize")
+    if variant["spacing"] is not None:
+        lines.append(f"\\ifdefined\\setlist\\setlist{{{LIST_SPACING[variant['spacing']]}}}\\fi")
+    return "\n".join(lines)
+
+
+def apply_layout(latex_code: str, variant: Dict) -> str:
+    """
+    Insert the overrides of a layout variant after \\begin{document}.
+
+    Returns:
+        Modified LaTeX source (unchanged for the original variant or when
+        the source has no document environment)
+    """
+    overrides = layout_overrides(variant)
+    index = latex_code.find(BEGIN_DOCUMENT)
+    if not overrides or index == -1:
+        return latex_code
+
+    index += len(BEGIN_DOCUMENT)
+    return latex_code[:index] + "\n" + overrides + "\n" + latex_code[index:]
+
+
+def count_pages(pdf: bytes) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(io.BytesIO(pdf)).pages)
+
+
+def best_variant(results: Dict[int, Dict], target_pages: int) -> Optional[int]:
+    """
+    Pick the least aggressive variant that fits, or the one with the fewest pages.
+
+    Args:
+        results: Successful compiles by variant index, each with a "pages" count
+        target_pages: Page limit
+
+    Returns:
+        Variant index, or None if nothing compiled
+    """
+    fitting = [index for index, result in results.items() if result["pages"] <= target_pages]
+    if fitting:
+        return min(fitting)
+    if results:
+        return min(results, key=lambda index: (results[index]["pages"], index))
+    return None
+
+
+async def fit_to_pages(latex_code: str, target_pages: int,
+                       compile_variant: Callable[[str], Awaitable[Dict]],
+                       budget_seconds: float) -> Dict:
+    """
+    Compile layout variants concurrently and return the best one within a time budget.
+
+    The search stops early once a variant fits and every less aggressive
+    variant has finished, since nothing left could beat it.
+
+    Args:
+        latex_code: Complete LaTeX document
+        target_pages: Page limit
+        compile_variant: Coroutine compiling one source, returning a compile result
+            dictionary (success, pdf, passes)
+        budget_seconds: Time after which unfinished variants are abandoned
+            (compiles already running still finish into the PDF cache and
+            keep their compile slot until then)
+
+    Returns:
+        Dictionary with the chosen variant, its result and page count, the
+        number of variants tried and the exceptions of failed variants
+    """
+    started = time.monotonic()
+    variants = variants_for(latex_code)
+    tasks = {
+        asyncio.ensure_future(compile_variant(apply_layout(latex_code, variant))): index
+        for index, variant in enumerate(variants)
+    }
+
+    results: Dict[int, Dict] = {}
+    failed: Dict[int, BaseException] = {}
+    pending = set(tasks)
+
+    try:
+        while pending:
+            remaining = budget_seconds - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                index = tasks[task]
+                if task.exception() is not None:
+                    failed[index] = task.exception()
+                    continue
+                result = task.result()
+                if result["success"]:
+                    result["pages"] = count_pages(result["pdf"])
+                    results[index] = result
+                else:
+                    failed[index] = VariantFailed(variants[index], result)
+
+            chosen = best_variant(results, target_pages)
+            if chosen is not None and results[chosen]["pages"] <= target_pages:
+                if all(index in results or index in failed for index in range(chosen)):
+                    break
+    finally:
+        # Stops only the waiting; see BoundedScheduler.run
+        for task in pending:
+            task.cancel()
+
+    chosen = best_variant(results, target_pages)
+    return {
+        "variant": variants[chosen] if chosen is not None else None,
+        "result": results.get(chosen),
+        "pages": results[chosen]["pages"] if chosen is not None else None,
+        "fits": chosen is not None and results[chosen]["pages"] <= target_pages,
+        "compiled": len(results),
+        "errors": failed,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
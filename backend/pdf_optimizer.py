@@ -0,0 +1,154 @@
+"""
+PDF Optimizer
+Shrinks compiled PDFs before they are cached and downloaded.
+
+pypdf recompresses every page content stream and merges identical
+objects (fonts and resources repeated by pdflatex), dropping the ones
+left unreferenced. If qpdf is installed the result is also linearized,
+so viewers can show the first page before the whole file has arrived.
+The smaller of the original and the optimized file is kept.
+"""
+
+import io
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend import latex_compiler
+from backend.config import Config
+
+
+def qpdf_command() -> Optional[str]:
+    """Locate qpdf (configured path first, then PATH), or None if it is not installed."""
+    if Config.QPDF_PATH and Path(Config.QPDF_PATH).exists():
+        return Config.QPDF_PATH
+    return shutil.which("qpdf")
+
+
+def compress_pdf(pdf: bytes) -> bytes:
+    """Recompress content streams and deduplicate objects with pypdf."""
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(pdf)))
+    for page in writer.pages:
+        page.compress_content_streams(level=9)
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def linearize_pdf(pdf: bytes) -> Optional[bytes]:
+    """
+    Linearize a PDF with qpdf (fast web view), packing objects into object streams.
+
+    Returns:
+        Linearized PDF bytes, or None if qpdf is not installed or failed
+    """
+    command = qpdf_command()
+    if not command:
+        return None
+
+    workdir = latex_compiler.workspaces.acquire()
+    try:
+        source = Path(workdir) / "optimize-in.pdf"
+        target = Path(workdir) / "optimize-out.pdf"
+        source.write_bytes(pdf)
+        result = subprocess.run(
+            [command, '--linearize', '--object-streams=generate', str(source), str(target)],
+            capture_output=True, timeout=Config.LATEX_TIMEOUT
+        )
+        # Exit code 3 means success with warnings
+        if result.returncode not in (0, 3) or not target.exists():
+            return None
+        return target.read_bytes()
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"qpdf failed: {e}")
+        return None
+    finally:
+        latex_compiler.workspaces.release(workdir)
+
+
+class OptimizerStats:
+    """Thread-safe totals of the bytes saved by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.linearized = 0
+        self.failures = 0
+        self.original_bytes = 0
+        self.optimized_bytes = 0
+
+    def record(self, report: Dict) -> None:
+        with self._lock:
+            self.documents += 1
+            self.linearized += report["linearized"]
+            self.failures += report["failed"]
+            self.original_bytes += report["original_size"]
+            self.optimized_bytes += report["optimized_size"]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            saved = self.original_bytes - self.optimized_bytes
+            return {
+                "enabled": Config.ENABLE_PDF_OPTIMIZATION,
+                "linearize": qpdf_command() is not None,
+                "documents": self.documents,
+                "linearized": self.linearized,
+                "failures": self.failures,
+                "original_bytes": self.original_bytes,
+                "optimized_bytes": self.optimized_bytes,
+                "saved_bytes": saved,
+                "saved_ratio": round(saved / self.original_bytes, 3) if self.original_bytes else 0.0,
+            }
+
+
+stats = OptimizerStats()
+
+
+def optimize_pdf(pdf: bytes) -> Dict:
+    """
+    Optimize a compiled PDF.
+
+    Never fails: if pypdf or qpdf cannot process the file, the original
+    bytes are returned.
+
+    Args:
+        pdf: PDF bytes from pdflatex
+
+    Returns:
+        Dictionary with the PDF to serve and a report (original_size,
+        optimized_size, saved_bytes, linearized, failed)
+    """
+    optimized = pdf
+    failed = False
+    linearized = False
+
+    try:
+        compressed = compress_pdf(pdf)
+        if len(compressed) < len(optimized):
+            optimized = compressed
+    except Exception as e:
+        print(f"PDF optimization failed: {e}")
+        failed = True
+
+    if Config.ENABLE_PDF_LINEARIZE:
+        linear = linearize_pdf(optimized)
+        # Linearization adds hint tables; keep it unless it costs more than it saves
+        if linear is not None and len(linear) <= len(pdf):
+            optimized = linear
+            linearized = True
+
+    report = {
+        "original_size": len(pdf),
+        "optimized_size": len(optimized),
+        "saved_bytes": len(pdf) - len(optimized),
+        "linearized": linearized,
+        "failed": failed,
+    }
+    stats.record(report)
+    return {"pdf": optimized, "report": report}
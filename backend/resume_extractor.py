@@ -3,10 +3,25 @@ Resume Information Extractor
 Extracts structured data from PDF, DOCX, and TXT resume files.
 """
 
+import io
+import json
+import multiprocessing
 import re
-from typing import Dict, List
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Union
+from backend.config import Config
 from backend.llm import generate_with_ai
 
+# Characters of resume text sent to the model; PDF text is only read up to this
+AI_TEXT_BUDGET = 3000
+
+# Uploads arrive as a spooled file; bytes are accepted too
+ResumeSource = Union[bytes, BinaryIO]
+
+_page_executor: Optional[ProcessPoolExecutor] = None
+_page_executor_lock = threading.Lock()
+
 def extract_email(text: str) -> str:
     """Extract email address from text."""
     email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
@@ -58,7 +73,7 @@ def extract_from_text_with_ai(text: str) -> Dict:
     prompt = f"""Extract structured information from this resume text and return it as JSON.
 
 Resume Text:
-{text[:3000]}  # Limit to first 3000 chars
+{text[:AI_TEXT_BUDGET]}
 
 Extract the following information:
 1. Personal Information: name, email, phone, location
@@ -81,26 +96,34 @@ Return as valid JSON with this structure:
 Only return the JSON, no explanation."""
 
     try:
-        ai_response = generate_with_ai(prompt, max_tokens=1500)
-
-        # Try to parse JSON from response
-        import json
-
-        # Clean response (remove markdown code blocks if present)
-        clean_response = ai_response.strip()
-        if clean_response.startswith('```'):
-            clean_response = clean_response.split('```')[1]
-            if clean_response.startswith('json'):
-                clean_response = clean_response[4:]
-        clean_response = clean_response.strip()
-
-        data = json.loads(clean_response)
+        # Replies that are not valid JSON are not cached, so a re-upload asks again
+        ai_response = generate_with_ai(prompt, max_tokens=1500,
+                                       cache_if=lambda text: parse_ai_json(text) is not None)
+        data = parse_ai_json(ai_response)
+        if data is None:
+            print("AI extraction failed: response is not valid JSON")
         return data
 
     except Exception as e:
         print(f"AI extraction failed: {e}")
         return None
 
+
+def parse_ai_json(response: str) -> Optional[Dict]:
+    """Parse the JSON object of an AI reply, allowing a markdown code block around it."""
+    # Clean response (remove markdown code blocks if present)
+    clean_response = response.strip()
+    if clean_response.startswith('```'):
+        clean_response = clean_response.split('```')[1]
+        if clean_response.startswith('json'):
+            clean_response = clean_response[4:]
+    clean_response = clean_response.strip()
+
+    try:
+        return json.loads(clean_response)
+    except ValueError:
+        return None
+
 def extract_basic_info(text: str) -> Dict:
     """Extract basic information using regex patterns."""
 
@@ -172,39 +195,115 @@ def extract_basic_info(text: str) -> Dict:
         "links": links
     }
 
-def extract_from_pdf(content: bytes) -> Dict:
-    """Extract information from PDF resume."""
-    try:
-        from pypdf import PdfReader
-        import io
+def open_source(source: ResumeSource) -> BinaryIO:
+    """File-like view of an upload: bytes are wrapped, files are rewound and read in place."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def read_source(source: ResumeSource) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    return open_source(source).read()
+
+
+def get_page_executor() -> ProcessPoolExecutor:
+    """Return the process pool for PDF page extraction, creating it on first use."""
+    global _page_executor
+    with _page_executor_lock:
+        if _page_executor is None:
+            _page_executor = ProcessPoolExecutor(
+                max_workers=Config.PDF_EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _page_executor
+
+
+def shutdown() -> None:
+    global _page_executor
+    with _page_executor_lock:
+        if _page_executor is not None:
+            _page_executor.shutdown(wait=False, cancel_futures=True)
+            _page_executor = None
+
+
+def extract_page_range(content: bytes, start: int, stop: int) -> List[str]:
+    """Extract the text of pages start..stop-1 (runs in a worker process)."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(content))
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def extract_pdf_text(source: ResumeSource, max_chars: Optional[int] = None) -> str:
+    """
+    Extract the text of a PDF without reading more pages than needed.
+
+    Pages are read one at a time until max_chars characters are collected.
+    When the full text is needed (no max_chars), long documents are split
+    into page ranges that are extracted in parallel worker processes.
+    Either way at most Config.PDF_EXTRACT_MAX_PAGES pages are read.
+
+    Args:
+        source: PDF bytes or file
+        max_chars: Stop once this many characters are collected (None = all pages)
+
+    Returns:
+        Page texts joined by newlines
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(open_source(source))
+    page_count = min(len(reader.pages), Config.PDF_EXTRACT_MAX_PAGES)
+
+    workers = min(Config.PDF_EXTRACT_WORKERS, page_count)
+    if max_chars is None and workers > 1 and page_count >= Config.PDF_PARALLEL_MIN_PAGES:
+        step = -(-page_count // workers)
+        try:
+            # Worker processes need their own copy of the document
+            content = read_source(source)
+            futures = [get_page_executor().submit(extract_page_range, content, start, min(start + step, page_count))
+                       for start in range(0, page_count, step)]
+            return "\n".join(text for future in futures for text in future.result())
+        except Exception as e:
+            print(f"Parallel PDF extraction failed, reading pages serially: {e}")
+
+    pages = []
+    length = 0
+    for index in range(page_count):
+        pages.append(reader.pages[index].extract_text() or "")
+        length += len(pages[-1]) + 1
+        if max_chars is not None and length >= max_chars:
+            break
+    return "\n".join(pages)
 
-        pdf_file = io.BytesIO(content)
-        pdf_reader = PdfReader(pdf_file)
 
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
+def extract_from_pdf(content: ResumeSource) -> Dict:
+    """Extract information from PDF resume (bytes or file)."""
+    try:
+        # The model only sees the first AI_TEXT_BUDGET characters
+        text = extract_pdf_text(content, max_chars=AI_TEXT_BUDGET)
 
         # Try AI extraction first
         ai_result = extract_from_text_with_ai(text)
         if ai_result:
             return ai_result
 
-        # Fallback to basic extraction
-        return extract_basic_info(text)
+        # Fallback to basic extraction, which scans the whole document
+        return extract_basic_info(extract_pdf_text(content))
 
     except Exception as e:
         print(f"PDF extraction error: {e}")
         return extract_basic_info("")
 
-def extract_from_docx(content: bytes) -> Dict:
-    """Extract information from DOCX resume."""
+def extract_from_docx(content: ResumeSource) -> Dict:
+    """Extract information from DOCX resume (bytes or file)."""
     try:
         import docx
-        import io
 
-        doc_file = io.BytesIO(content)
-        doc = docx.Document(doc_file)
+        doc = docx.Document(open_source(content))
 
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
 
@@ -220,10 +319,10 @@ def extract_from_docx(content: bytes) -> Dict:
         print(f"DOCX extraction error: {e}")
         return extract_basic_info("")
 
-def extract_from_txt(content: bytes) -> Dict:
-    """Extract information from TXT resume."""
+def extract_from_txt(content: ResumeSource) -> Dict:
+    """Extract information from TXT resume (bytes or file)."""
     try:
-        text = content.decode('utf-8')
+        text = read_source(content).decode('utf-8')
 
         # Try AI extraction first
         ai_result = extract_from_text_with_ai(text)
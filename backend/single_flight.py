@@ -0,0 +1,77 @@
+"""
+Single Flight
+Coalesces concurrent identical calls into one execution.
+
+While a call for a key is in flight, later callers with the same key do
+not start their own; they wait for the running one and get its result
+(or its exception). Once it finishes the key is released, so the next
+call runs again (results are not cached here). Waiting threads block on
+a threading.Event.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """One in-flight execution and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {"executed": 0, "shared": 0}
+
+    def do(self, key: str, func: Callable, *args) -> Any:
+        """
+        Run ``func(*args)`` unless a call with ``key`` is already running, then wait for that one.
+
+        Raises:
+            Whatever the shared execution raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            Dictionary with executed and shared call counts and the calls in flight
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                **self._stats,
+                "in_flight": len(self._calls),
+            }
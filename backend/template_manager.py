@@ -1,7 +1,27 @@
+"""
+LaTeX Template Manager
+Provides LaTeX template structures for different resume styles.
+
+Every template is parsed once, at import, into a render plan: the
+preamble plus a tree of literal LaTeX, slots and optional blocks.
+
+Template syntax (only the slot names in SLOT_NAMES are recognised, so
+ordinary LaTeX groups are left alone):
+
+    {name}                  value or rendered section for a slot
+    {#experience} ... {/experience}
+                            block that is only emitted when the slot has data
+
+A block tag alone on its line takes the line break with it.
+"""
+
 import os
 import json
+import re
 from typing import Dict, List, Optional
 
+from backend.content_cache import content_hash
+
 # Determine base directory
 BASE_DIR = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
 DB_DIR = os.path.join( BASE_DIR, "simple_db" )
@@ -11,314 +31,543 @@ print( "📋 Template Database:", DB_FILE )
 
 _templates = None
 
-"""
-LaTeX Template Manager
-Provides LaTeX template structures for different resume styles.
-"""
-
-
-def get_latex_template ( template_name: str ) -> str :
+BEGIN_DOCUMENT = "\\begin{document}"
+
+# Plain values from personal_info
+FIELD_SLOTS = ("name", "email", "phone", "location", "website", "summary")
+# Rendered by the section renderers of a template's style
+SECTION_SLOTS = ("contact", "education", "experience", "projects", "skills", "certifications")
+SLOT_NAMES = FIELD_SLOTS + SECTION_SLOTS
+
+# Plan nodes: literal text is a plain string
+SLOT = "slot"    # (SLOT, name)
+BLOCK = "block"  # (BLOCK, name, children)
+
+_SLOT_ALTERNATION = "|".join( SLOT_NAMES )
+_TAG_PATTERN = re.compile(
+    r"^\{(?P<line_kind>[#/])(?P<line_name>" + _SLOT_ALTERNATION + r")\}\n"
+    r"|\{(?P<kind>[#/]?)(?P<name>" + _SLOT_ALTERNATION + r")\}",
+    re.MULTILINE
+)
+
+
+class TemplatePlan :
+    """A template parsed into its preamble and a tree of literal text, slots and blocks."""
+
+    def __init__ ( self, name: str, source: str, preamble: str, body: list, style: str,
+                   contact_separator: str ) :
+        self.name = name
+        self.source = source
+        self.preamble = preamble
+        self.body = body
+        self.style = style
+        self.contact_separator = contact_separator
+        self.slots = frozenset( _collect_slots( body ) )
+        # Identifies the template in caches of rendered sections
+        self.digest = content_hash( name, source, style, contact_separator )
+
+
+def _collect_slots ( nodes: list ) -> List[str] :
+    slots = []
+    for node in nodes :
+        if isinstance( node, tuple ) :
+            slots.append( node[1] )
+            if node[0] == BLOCK :
+                slots.extend( _collect_slots( node[2] ) )
+    return slots
+
+
+def compile_template ( name: str, source: str, style: str, contact_separator: str = " $|$ " ) -> TemplatePlan :
     """
-    Get LaTeX template structure by name.
+    Parse a template into a render plan.
 
     Args:
-        template_name: Name of the template (e.g., "modern_deedy", "awesome_cv")
+        name: Template name
+        source: Complete LaTeX template with slots
+        style: Section renderer set used for the sections ("deedy" or "plain")
+        contact_separator: LaTeX placed between contact entries
 
     Returns:
-        LaTeX template string
+        TemplatePlan
+
+    Raises:
+        ValueError: No document environment or unbalanced blocks
     """
-    templates = {
-        "modern_deedy" : """\\documentclass[letterpaper,11pt]{article}
-\\usepackage[utf8]{inputenc}
-\\usepackage{geometry}
-\\usepackage{enumitem}
-\\usepackage{hyperref}
-\\usepackage{xcolor}
+    index = source.find( BEGIN_DOCUMENT )
+    if index == -1 :
+        raise ValueError( f"Template {name} has no \\begin{{document}}" )
+    preamble, text = source[:index], source[index:]
+
+    root: list = []
+    stack = [(None, root)]
+    position = 0
+
+    for match in _TAG_PATTERN.finditer( text ) :
+        if match.start() > position :
+            stack[-1][1].append( text[position:match.start()] )
+        position = match.end()
+
+        kind = match.group( "line_kind" ) or match.group( "kind" )
+        slot = match.group( "line_name" ) or match.group( "name" )
+
+        if kind == "#" :
+            children: list = []
+            stack[-1][1].append( (BLOCK, slot, children) )
+            stack.append( (slot, children) )
+        elif kind == "/" :
+            if stack[-1][0] != slot :
+                raise ValueError( f"Template {name}: unexpected {{/{slot}}}" )
+            stack.pop()
+        else :
+            stack[-1][1].append( (SLOT, slot) )
+
+    if len( stack ) > 1 :
+        raise ValueError( f"Template {name}: {{#{stack[-1][0]}}} is never closed" )
+    if position < len( text ) :
+        root.append( text[position:] )
+
+    return TemplatePlan( name, source, preamble, root, style, contact_separator )
+
+
+# =====================================================
+# Templates
+# =====================================================
+# Shared preambles (everything before \begin{document}). They are identical
+# for every resume of a template, so the compile engine precompiles them.
+MODERN_DEEDY_PREAMBLE = r"""\documentclass[letterpaper,11pt]{article}
+
+\usepackage{latexsym}
+\usepackage[margin=0.5in]{geometry}
+\usepackage{titlesec}
+\usepackage{marvosym}
+\usepackage[usenames,dvipsnames]{color}
+\usepackage{verbatim}
+\usepackage{enumitem}
+\usepackage[hidelinks]{hyperref}
+\usepackage{fancyhdr}
+\usepackage[english]{babel}
+\usepackage{tabularx}
+
+\pagestyle{fancy}
+\fancyhf{}
+\fancyfoot{}
+\renewcommand{\headrulewidth}{0pt}
+\renewcommand{\footrulewidth}{0pt}
+
+\urlstyle{same}
+
+\raggedbottom
+\raggedright
+\setlength{\tabcolsep}{0in}
+
+\titleformat{\section}{
+  \vspace{-4pt}\scshape\raggedright\large
+}{}{0em}{}[\color{black}\titlerule \vspace{-5pt}]
+
+\newcommand{\resumeItem}[1]{
+  \item\small{
+    {#1 \vspace{-2pt}}
+  }
+}
+
+\newcommand{\resumeSubheading}[4]{
+  \vspace{-1pt}\item
+    \begin{tabular*}{0.97\textwidth}[t]{l@{\extracolsep{\fill}}r}
+      \textbf{#1} & #2 \\
+      \textit{\small#3} & \textit{\small #4} \\
+    \end{tabular*}\vspace{-5pt}
+}
+
+\newcommand{\resumeProjectHeading}[2]{
+    \item
+    \begin{tabular*}{0.97\textwidth}{l@{\extracolsep{\fill}}r}
+      \small#1 & #2 \\
+    \end{tabular*}\vspace{-5pt}
+}
+
+\renewcommand\labelitemii{$\vcenter{\hbox{\tiny$\bullet$}}$}
+
+\newcommand{\resumeSubHeadingListStart}{\begin{itemize}[leftmargin=0.15in, label={}]}
+\newcommand{\resumeSubHeadingListEnd}{\end{itemize}}
+\newcommand{\resumeItemListStart}{\begin{itemize}}
+\newcommand{\resumeItemListEnd}{\end{itemize}\vspace{-5pt}}
 
-\\geometry{left=0.75in, right=0.75in, top=0.75in, bottom=0.75in}
-\\setlength{\\parindent}{0pt}
-\\pagestyle{empty}
+"""
 
-\\definecolor{primary}{RGB}{33, 150, 243}
-\\hypersetup{colorlinks=true, linkcolor=primary, urlcolor=primary}
+TECH_RESUME_PREAMBLE = r"""\documentclass[letterpaper,11pt]{article}
 
-\\begin{document}
+\usepackage[utf8]{inputenc}
+\usepackage[T1]{fontenc}
+\usepackage{geometry}
+\usepackage{hyperref}
+\usepackage{enumitem}
+\usepackage{titlesec}
 
-% HEADER
-{\\Huge \\textbf{{{name}}}}\\\\[5pt]
-{email} \\textbar{} {phone} \\textbar{} {location}\\\\
-{links}
+\geometry{left=0.75in,right=0.75in,top=0.75in,bottom=0.75in}
 
-\\vspace{10pt}
+\titleformat{\section}{\large\bfseries}{}{0em}{}[\titlerule]
+\titlespacing{\section}{0pt}{10pt}{5pt}
 
-% SUMMARY
-\\section*{Professional Summary}
-{summary}
+\setlist[itemize]{leftmargin=*,noitemsep,topsep=0pt}
 
-\\vspace{10pt}
+\hypersetup{
+    colorlinks=true,
+    linkcolor=blue,
+    urlcolor=blue,
+}
 
-% EXPERIENCE
-\\section*{Experience}
-{experience}
+"""
+
+MODERN_DEEDY_BODY = r"""\begin{document}
+
+\begin{center}
+    \textbf{\Huge \scshape {name}} \\ \vspace{1pt}
+    \small {contact}
+\end{center}
 
-\\vspace{10pt}
+{#summary}
+\section{Professional Summary}
+\small{{summary}}
 
-% EDUCATION
-\\section*{Education}
+{/summary}
+{#education}
+\section{Education}
 {education}
 
-\\vspace{10pt}
+{/education}
+{#experience}
+\section{Experience}
+{experience}
+
+{/experience}
+{#projects}
+\section{Projects}
+{projects}
+
+{/projects}
+{#skills}
+\section{Technical Skills}
+ \begin{itemize}[leftmargin=0.15in, label={}]
+    \small{\item{
+     \textbf{Skills}{: {skills}}
+    }}
+ \end{itemize}
+
+{/skills}
+{#certifications}
+\section{Certifications}
+{certifications}
 
-% SKILLS
-\\section*{Skills}
+{/certifications}
+\end{document}
+"""
+
+TECH_RESUME_BODY = r"""\begin{document}
+
+\begin{center}
+    {\LARGE \textbf{{name}}} \\
+    \vspace{3pt}
+    {contact}
+\end{center}
+
+{#skills}
+\section*{Technical Skills}
 {skills}
 
-\\vspace{10pt}
+{/skills}
+{#experience}
+\section*{Experience}
+{experience}
 
-% PROJECTS
-\\section*{Projects}
+{/experience}
+{#projects}
+\section*{Projects}
 {projects}
 
-\\end{document}""",
+{/projects}
+{#education}
+\section*{Education}
+{education}
 
-        "awesome_cv" : """\\documentclass[11pt,a4paper]{article}
-\\usepackage[utf8]{inputenc}
-\\usepackage{geometry}
-\\usepackage{enumitem}
-\\usepackage{hyperref}
-\\usepackage{xcolor}
-\\usepackage{multicol}
+{/education}
+\end{document}
+"""
 
-\\geometry{left=1in, right=1in, top=1in, bottom=1in}
-\\setlength{\\parindent}{0pt}
-\\pagestyle{empty}
+AWESOME_CV = r"""\documentclass[11pt,a4paper]{article}
+\usepackage[utf8]{inputenc}
+\usepackage{geometry}
+\usepackage{enumitem}
+\usepackage{hyperref}
+\usepackage{xcolor}
+\usepackage{multicol}
 
-\\definecolor{awesome}{RGB}{64, 64, 64}
-\\hypersetup{colorlinks=true, linkcolor=awesome, urlcolor=awesome}
+\geometry{left=1in, right=1in, top=1in, bottom=1in}
+\setlength{\parindent}{0pt}
+\pagestyle{empty}
 
-\\begin{document}
+\definecolor{awesome}{RGB}{64, 64, 64}
+\hypersetup{colorlinks=true, linkcolor=awesome, urlcolor=awesome}
 
-% HEADER
-{\\LARGE \\textbf{{{name}}}}\\\\[3pt]
-\\hrule
-\\vspace{5pt}
-{email} \\textbar{} {phone} \\textbar{} {location}\\\\
-{links}
+\begin{document}
 
-\\vspace{15pt}
-
-\\begin{minipage}[t]{0.65\\textwidth}
-    \\section*{Experience}
-    {experience}
+% HEADER
+{\LARGE \textbf{{name}}}\\[3pt]
+\hrule
+\vspace{5pt}
+{contact}{#location} \textbar{} {location}{/location}
 
-    \\vspace{10pt}
+\vspace{15pt}
 
-    \\section*{Projects}
-    {projects}
-\\end{minipage}
-\\hfill
-\\begin{minipage}[t]{0.3\\textwidth}
-    \\section*{Education}
-    {education}
+\begin{minipage}[t]{0.65\textwidth}
+{#experience}
+    \section*{Experience}
+{experience}
+    \vspace{10pt}
 
-    \\vspace{10pt}
+{/experience}
+{#projects}
+    \section*{Projects}
+{projects}
+{/projects}
+\end{minipage}
+\hfill
+\begin{minipage}[t]{0.3\textwidth}
+{#education}
+    \section*{Education}
+{education}
+    \vspace{10pt}
 
-    \\section*{Skills}
+{/education}
+{#skills}
+    \section*{Skills}
     {skills}
-\\end{minipage}
+{/skills}
+\end{minipage}
 
-\\end{document}""",
+\end{document}
+"""
 
-        "classic_altacv" : """\\documentclass[10pt,a4paper]{article}
-\\usepackage[utf8]{inputenc}
-\\usepackage{geometry}
-\\usepackage{enumitem}
-\\usepackage{hyperref}
-\\usepackage{xcolor}
-\\usepackage{tikz}
+CLASSIC_ALTACV = r"""\documentclass[10pt,a4paper]{article}
+\usepackage[utf8]{inputenc}
+\usepackage{geometry}
+\usepackage{enumitem}
+\usepackage{hyperref}
+\usepackage{xcolor}
+\usepackage{tikz}
 
-\\geometry{left=0.5in, right=0.5in, top=0.5in, bottom=0.5in}
-\\setlength{\\parindent}{0pt}
-\\pagestyle{empty}
+\geometry{left=0.5in, right=0.5in, top=0.5in, bottom=0.5in}
+\setlength{\parindent}{0pt}
+\pagestyle{empty}
 
-\\definecolor{accent}{RGB}{0, 102, 204}
-\\hypersetup{colorlinks=true, linkcolor=accent, urlcolor=accent}
+\definecolor{accent}{RGB}{0, 102, 204}
+\hypersetup{colorlinks=true, linkcolor=accent, urlcolor=accent}
 
-\\begin{document}
+\begin{document}
 
-\\begin{minipage}[t]{0.35\\textwidth}
+\begin{minipage}[t]{0.35\textwidth}
     % SIDEBAR
-    {\\Large \\textbf{{{name}}}}\\\\[5pt]
-    \\textcolor{accent}{\\rule{\\linewidth}{2pt}}
+    {\Large \textbf{{name}}}\\[5pt]
+    \textcolor{accent}{\rule{\linewidth}{2pt}}
 
-    \\vspace{10pt}
+    \vspace{10pt}
 
-    \\textbf{Contact}\\\\
-    {email}\\\\
-    {phone}\\\\
-    {location}\\\\
-    {links}
+    \textbf{Contact}\\
+    {contact}{#location}\\
+    {location}{/location}
+{#skills}
 
-    \\vspace{15pt}
+    \vspace{15pt}
 
-    \\textbf{Skills}\\\\
+    \textbf{Skills}\\
     {skills}
+{/skills}
+{#education}
 
-    \\vspace{15pt}
+    \vspace{15pt}
 
-    \\textbf{Education}\\\\
-    {education}
-\\end{minipage}
-\\hfill
-\\begin{minipage}[t]{0.6\\textwidth}
+    \textbf{Education}\\
+{education}
+{/education}
+\end{minipage}
+\hfill
+\begin{minipage}[t]{0.6\textwidth}
     % MAIN CONTENT
-    \\section*{Professional Summary}
+{#summary}
+    \section*{Professional Summary}
     {summary}
 
-    \\vspace{10pt}
+    \vspace{10pt}
 
-    \\section*{Experience}
-    {experience}
+{/summary}
+{#experience}
+    \section*{Experience}
+{experience}
+    \vspace{10pt}
 
-    \\vspace{10pt}
+{/experience}
+{#projects}
+    \section*{Projects}
+{projects}
+{/projects}
+\end{minipage}
 
-    \\section*{Projects}
-    {projects}
-\\end{minipage}
+\end{document}
+"""
 
-\\end{document}""",
+ACADEMIC = r"""\documentclass[11pt,a4paper]{article}
+\usepackage[utf8]{inputenc}
+\usepackage{geometry}
+\usepackage{enumitem}
+\usepackage{hyperref}
 
-        "academic" : """\\documentclass[11pt,a4paper]{article}
-\\usepackage[utf8]{inputenc}
-\\usepackage{geometry}
-\\usepackage{enumitem}
-\\usepackage{hyperref}
+\geometry{left=1in, right=1in, top=1in, bottom=1in}
+\setlength{\parindent}{0pt}
 
-\\geometry{left=1in, right=1in, top=1in, bottom=1in}
-\\setlength{\\parindent}{0pt}
+\begin{document}
 
-\\begin{document}
+\begin{center}
+{\Large \textbf{{name}}}\\[5pt]
+{contact}{#location}\\
+{location}{/location}
+\end{center}
 
-\\begin{center}
-{\\Large \\textbf{{{name}}}}\\\\[5pt]
-{email} \\textbar{} {phone}\\\\
-{location}\\\\
-{links}
-\\end{center}
+\vspace{15pt}
 
-\\vspace{15pt}
+{#summary}
+{summary}
 
-\\section*{Education}
-{education}
+\vspace{10pt}
 
-\\vspace{10pt}
+{/summary}
+{#education}
+\section*{Education}
+{education}
+\vspace{10pt}
 
-\\section*{Research Experience}
+{/education}
+{#experience}
+\section*{Research Experience}
 {experience}
+\vspace{10pt}
 
-\\vspace{10pt}
-
-\\section*{Publications}
+{/experience}
+{#projects}
+\section*{Publications}
 {projects}
+\vspace{10pt}
 
-\\vspace{10pt}
-
-\\section*{Skills}
+{/projects}
+{#skills}
+\section*{Skills}
 {skills}
 
-\\vspace{10pt}
+\vspace{10pt}
 
-\\section*{Certifications}
+{/skills}
+{#certifications}
+\section*{Certifications}
 {certifications}
+{/certifications}
+\end{document}
+"""
 
-\\end{document}""",
-
-        "tech_resume" : """\\documentclass[letterpaper,11pt]{article}
-\\usepackage[utf8]{inputenc}
-\\usepackage{geometry}
-\\usepackage{enumitem}
-\\usepackage{hyperref}
-\\usepackage{xcolor}
+MINIMALIST = r"""\documentclass[11pt,a4paper]{article}
+\usepackage[utf8]{inputenc}
+\usepackage{geometry}
+\usepackage{enumitem}
+\usepackage{hyperref}
 
-\\geometry{left=0.5in, right=0.5in, top=0.5in, bottom=0.5in}
-\\setlength{\\parindent}{0pt}
-\\pagestyle{empty}
+\geometry{left=1in, right=1in, top=1in, bottom=1in}
+\setlength{\parindent}{0pt}
+\pagestyle{empty}
 
-\\definecolor{techblue}{RGB}{0, 119, 181}
-\\hypersetup{colorlinks=true, linkcolor=techblue, urlcolor=techblue}
+\hypersetup{colorlinks=true, linkcolor=black, urlcolor=black}
 
-\\begin{document}
+\begin{document}
 
-{\\LARGE \\textbf{{{name}}}}\\\\[3pt]
-{email} \\textbar{} {phone} \\textbar{} {links}
+{\Large {name}}\\[2pt]
+{contact}{#location} \textbar{} {location}{/location}
 
-\\vspace{10pt}
+\vspace{15pt}
 
-\\section*{\\textcolor{techblue}{Technical Skills}}
-{skills}
+{#summary}
+\textbf{Summary}\\
+{summary}
 
-\\vspace{10pt}
+\vspace{10pt}
 
-\\section*{\\textcolor{techblue}{Experience}}
+{/summary}
+{#experience}
+\textbf{Experience}\\
 {experience}
+\vspace{10pt}
 
-\\vspace{10pt}
-
-\\section*{\\textcolor{techblue}{Projects}}
-{projects}
-
-\\vspace{10pt}
-
-\\section*{\\textcolor{techblue}{Education}}
+{/experience}
+{#education}
+\textbf{Education}\\
 {education}
+\vspace{10pt}
 
-\\end{document}""",
-
-        "minimalist" : """\\documentclass[11pt,a4paper]{article}
-\\usepackage[utf8]{inputenc}
-\\usepackage{geometry}
-\\usepackage{enumitem}
-\\usepackage{hyperref}
+{/education}
+{#skills}
+\textbf{Skills}\\
+{skills}
 
-\\geometry{left=1in, right=1in, top=1in, bottom=1in}
-\\setlength{\\parindent}{0pt}
-\\pagestyle{empty}
+\vspace{10pt}
 
-\\hypersetup{colorlinks=true, linkcolor=black, urlcolor=black}
+{/skills}
+{#projects}
+\textbf{Projects}\\
+{projects}
+{/projects}
+\end{document}
+"""
 
-\\begin{document}
+DEFAULT_TEMPLATE = "modern_deedy"
 
-{\\Large {name}}\\\\[2pt]
-{email} \\textbar{} {phone} \\textbar{} {location}\\\\
-{links}
+# Parsed once at import; rendering only fills the plans
+_registry: Dict[str, TemplatePlan] = {
+    "modern_deedy" : compile_template( "modern_deedy", MODERN_DEEDY_PREAMBLE + MODERN_DEEDY_BODY, "deedy" ),
+    "awesome_cv" : compile_template( "awesome_cv", AWESOME_CV, "plain" ),
+    "classic_altacv" : compile_template( "classic_altacv", CLASSIC_ALTACV, "plain", contact_separator=" \\\\\n    " ),
+    "academic" : compile_template( "academic", ACADEMIC, "plain" ),
+    "tech_resume" : compile_template( "tech_resume", TECH_RESUME_PREAMBLE + TECH_RESUME_BODY, "plain" ),
+    "minimalist" : compile_template( "minimalist", MINIMALIST, "plain", contact_separator=" \\textbar{} " ),
+}
 
-\\vspace{15pt}
 
-\\textbf{Summary}\\\\
-{summary}
+def get_template_plan ( template_name: str ) -> TemplatePlan :
+    """
+    Get the render plan of a template.
 
-\\vspace{10pt}
+    Args:
+        template_name: Name of the template (e.g., "modern_deedy", "awesome_cv")
 
-\\textbf{Experience}\\\\
-{experience}
+    Returns:
+        TemplatePlan (modern_deedy for unknown names)
+    """
+    return _registry.get( template_name, _registry[DEFAULT_TEMPLATE] )
 
-\\vspace{10pt}
 
-\\textbf{Education}\\\\
-{education}
+def list_templates () -> List[str] :
+    """Names of all registered templates."""
+    return list( _registry )
 
-\\vspace{10pt}
 
-\\textbf{Skills}\\\\
-{skills}
+def template_preambles () -> List[str] :
+    """Distinct preambles of all templates (precompiled by the compile engine)."""
+    return list( dict.fromkeys( plan.preamble for plan in _registry.values() ) )
 
-\\vspace{10pt}
 
-\\textbf{Projects}\\\\
-{projects}
+def get_latex_template ( template_name: str ) -> str :
+    """
+    Get LaTeX template structure by name.
 
-\\end{document}"""
-    }
+    Args:
+        template_name: Name of the template (e.g., "modern_deedy", "awesome_cv")
 
+    Returns:
+        LaTeX template string
+    """
     # Return requested template or default to modern_deedy
-    return templates.get( template_name, templates["modern_deedy"] )
\ No newline at end of file
+    return get_template_plan( template_name ).source
@@ -0,0 +1,96 @@
+"""
+PDF Thumbnails
+Renders low-resolution PNG previews of compiled PDF pages.
+
+Pages are rendered with poppler's pdftoppm in a compile workspace and
+cached by the hash of the PDF bytes, so a preview of an unchanged
+document is served without rendering again.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from backend import latex_compiler
+from backend.config import Config
+from backend.content_cache import ContentCache, content_hash
+
+thumbnail_cache = ContentCache(
+    "thumbnails",
+    max_memory_bytes=Config.THUMBNAIL_CACHE_MEMORY_MB * 1024 * 1024,
+    disk_dir=os.path.join(Config.CACHE_DIR, "thumbnails"),
+    max_disk_bytes=Config.THUMBNAIL_CACHE_DISK_MB * 1024 * 1024,
+)
+
+
+def pdftoppm_command() -> Optional[str]:
+    """Locate poppler's pdftoppm, or None if it is not installed."""
+    return shutil.which("pdftoppm")
+
+
+def render_pages(pdf: bytes, dpi: int, max_pages: Optional[int] = None) -> List[bytes]:
+    """
+    Render PDF pages to PNG.
+
+    Args:
+        pdf: PDF bytes
+        dpi: Render resolution
+        max_pages: Only render the first N pages
+
+    Returns:
+        PNG bytes per page (empty if pdftoppm is not available)
+    """
+    command = pdftoppm_command()
+    if not command:
+        return []
+
+    workdir = latex_compiler.workspaces.acquire()
+    try:
+        source = Path(workdir) / "preview.pdf"
+        source.write_bytes(pdf)
+
+        args = [command, '-png', '-r', str(dpi)]
+        if max_pages:
+            args += ['-l', str(max_pages)]
+        subprocess.run(args + [str(source), str(Path(workdir) / "page")],
+                       cwd=workdir, capture_output=True, timeout=Config.LATEX_TIMEOUT)
+
+        # pdftoppm zero-pads page numbers to the width of the page count
+        pages = sorted(Path(workdir).glob("page-*.png"), key=lambda p: int(p.stem.rsplit("-", 1)[1]))
+        return [page.read_bytes() for page in pages]
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"Thumbnail rendering failed: {e}")
+        return []
+    finally:
+        latex_compiler.workspaces.release(workdir)
+
+
+def get_thumbnails(pdf: bytes, dpi: Optional[int] = None,
+                   max_pages: Optional[int] = None) -> Tuple[List[str], str]:
+    """
+    Get base64-encoded PNG thumbnails for a PDF, rendering them on a cache miss.
+
+    Args:
+        pdf: PDF bytes
+        dpi: Render resolution (defaults to Config.THUMBNAIL_DPI)
+        max_pages: Only render the first N pages
+
+    Returns:
+        Tuple of (list of base64 PNG strings, "HIT" or "MISS")
+    """
+    dpi = dpi or Config.THUMBNAIL_DPI
+    key = content_hash(hashlib.sha256(pdf).hexdigest(), str(dpi), str(max_pages or "all"))
+
+    cached = thumbnail_cache.get(key)
+    if cached is not None:
+        return json.loads(cached), "HIT"
+
+    pages = [base64.b64encode(png).decode("ascii") for png in render_pages(pdf, dpi, max_pages)]
+    if pages:
+        thumbnail_cache.put(key, json.dumps(pages).encode("utf-8"))
+    return pages, "MISS"
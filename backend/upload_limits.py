@@ -0,0 +1,62 @@
+"""
+Upload Limits
+ASGI middleware that caps the request body size of upload endpoints.
+
+A declared Content-Length over the limit is rejected before any of the
+body is read. Chunked or under-declared bodies are counted while they
+stream in and the request fails with 413 as soon as the limit is passed,
+so an oversized upload is never fully received, parsed or spooled.
+"""
+
+from typing import Iterable
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Room for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload too large. The limit is {max_bytes // (1024 * 1024)}MB."
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """Reject request bodies larger than max_bytes (plus multipart overhead) on the given paths."""
+
+    def __init__(self, app: ASGIApp, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.limit = max_bytes + MULTIPART_OVERHEAD
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.limit:
+                    response = JSONResponse({"detail": too_large(self.max_bytes).detail}, status_code=413)
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.limit:
+                    # Raised inside body parsing; the app's exception handler answers 413
+                    raise too_large(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,134 @@
+"""
+escape_latex Benchmark
+Compares the single-pass escaper with the previous chained str.replace
+implementation, per field and for a whole resume.
+
+Usage:
+    python benchmarks/escape_latex_bench.py [--number N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.latex_generator import escape_latex, escape_resume_data  # noqa: E402
+
+SAMPLE_RESUME = {
+    "personal_info": {
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "+1 555 123 4567",
+        "linkedin": "https://www.linkedin.com/in/jane_doe",
+        "github": "https://github.com/janedoe",
+        "summary": "Backend engineer with 8+ years building C++ & Python services; cut cloud costs by 35% "
+                   "and led the #1 rated internal platform team.",
+    },
+    "education": [
+        {"degree": "B.S.", "field": "Computer Science", "institution": "State University",
+         "location": "Boston, MA", "graduation": "2016", "gpa": "3.8"},
+    ],
+    "experience": [
+        {"title": "Senior Software Engineer", "company": "Acme Corp", "location": "New York, NY",
+         "start_date": "2020", "end_date": "Present",
+         "description": "- Designed an event pipeline handling 2M events/day\n"
+                        "- Reduced p99 latency by 40% with a shared_cache layer\n"
+                        "- Mentored 5 engineers"},
+        {"title": "Software Engineer", "company": "Widgets & Co", "location": "Remote",
+         "start_date": "2016", "end_date": "2020",
+         "description": "- Built billing exports ($1.2M/yr revenue)\n- Migrated services to Kubernetes"},
+    ],
+    "projects": [
+        {"name": "tex_lint", "technologies": "Python, C#", "github": "https://github.com/janedoe/tex_lint",
+         "description": "Static checks for {LaTeX} sources with ~200 rules"},
+    ],
+    "skills": ["Python", "C++", "C#", "Go", "PostgreSQL", "Kubernetes", "AWS", "Terraform"],
+    "certifications": [
+        {"name": "AWS Solutions Architect", "issuer": "Amazon", "date": "2021", "url": "https://aws.example/cert"},
+    ],
+}
+
+
+def legacy_escape_latex(text: str) -> str:
+    """The previous implementation (nine chained str.replace passes)."""
+    if not text:
+        return ""
+
+    replacements = {
+        '&': r'\&',
+        '%': r'\%',
+        '$': r'\$',
+        '#': r'\#',
+        '_': r'\_',
+        '{': r'\{',
+        '}': r'\}',
+        '~': r'\textasciitilde{}',
+        '^': r'\^{}',
+    }
+
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+
+    return text
+
+
+def legacy_escape_tree(data):
+    """Escape every string of a tree with one legacy call per field, as the generators used to."""
+    if isinstance(data, str):
+        return legacy_escape_latex(data)
+    if isinstance(data, dict):
+        return {key: legacy_escape_tree(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [legacy_escape_tree(item) for item in data]
+    return data
+
+
+def collect_strings(data, strings):
+    if isinstance(data, str):
+        strings.append(data)
+    elif isinstance(data, dict):
+        for value in data.values():
+            collect_strings(value, strings)
+    elif isinstance(data, list):
+        for item in data:
+            collect_strings(item, strings)
+    return strings
+
+
+def report(label: str, func, number: int, items: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    per_second = number * items / seconds
+    print(f"  {label:<28} {seconds / number * 1e6:9.2f} us/op  {per_second:14,.0f} items/s")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark escape_latex")
+    parser.add_argument("--number", type=int, default=2000, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    fields = collect_strings(SAMPLE_RESUME, [])
+    plain = [f for f in fields if escape_latex(f) == f]
+    special = [f for f in fields if escape_latex(f) != f]
+
+    print(f"Fields: {len(fields)} ({len(plain)} without special characters)")
+
+    for title, group in (("All fields", fields), ("Plain fields", plain), ("Fields with specials", special)):
+        print(f"\n{title}:")
+        old = report("legacy str.replace chain", lambda: [legacy_escape_latex(f) for f in group], args.number, len(group))
+        new = report("single-pass escape_latex", lambda: [escape_latex(f) for f in group], args.number, len(group))
+        print(f"  speedup: {old / new:.2f}x")
+
+    print("\nWhole resume tree:")
+    old = report("legacy per-field calls", lambda: legacy_escape_tree(SAMPLE_RESUME), args.number, 1)
+    new = report("escape_resume_data", lambda: escape_resume_data(SAMPLE_RESUME), args.number, 1)
+    print(f"  speedup: {old / new:.2f}x")
+
+    # Same output except for backslashes, which the legacy function left unescaped
+    assert all(escape_latex(f) == legacy_escape_latex(f) for f in fields if "\\" not in f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Tests for single-run batch documents and their page split."""
+
+import io
+import shutil
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from backend import batch_compiler, latex_compiler
+from backend.latex_generator import generate_latex_code
+
+RESUMES = [
+    {"personal_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+     "experience": [{"title": "Analyst", "company": "Engine Co", "start_date": "1842", "end_date": "1843",
+                     "description": "- Wrote the first program"}],
+     "skills": ["Mathematics"]},
+    {"personal_info": {"name": "Alan Turing", "email": "alan@example.com"},
+     "education": [{"degree": "PhD", "field": "Mathematics", "institution": "Princeton", "graduation": "1938"}],
+     "skills": ["Computability"]},
+]
+
+
+def blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(612, 792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def combined_batch(template: str) -> str:
+    codes = [generate_latex_code(resume_data=resume, template_name=template, industry="Technology")
+             for resume in RESUMES]
+    preambles, bodies = zip(*(latex_compiler.split_preamble(code) for code in codes))
+    assert len(set(preambles)) == 1
+    return batch_compiler.combine_documents(preambles[0], list(bodies))
+
+
+def test_each_resume_restarts_page_numbering_and_logs_shipout_count():
+    document = combined_batch("tech_resume")
+
+    assert document.count("\\setcounter{page}{1}") == len(RESUMES)
+    assert document.count(f"\\typeout{{{batch_compiler.BOUNDARY_MARKER}\\the\\ReadonlyShipoutCounter}}") == len(RESUMES)
+    assert "\\value{page}" not in document
+
+
+def test_split_pdf_uses_shipout_counts_as_page_ends():
+    log = f"{batch_compiler.BOUNDARY_MARKER}2\nnoise\n{batch_compiler.BOUNDARY_MARKER}3\n"
+
+    pdfs = batch_compiler.split_pdf(blank_pdf(3), log, 2)
+
+    assert [len(PdfReader(io.BytesIO(pdf)).pages) for pdf in pdfs] == [2, 1]
+
+
+def test_split_pdf_rejects_boundaries_that_do_not_add_up():
+    marker = batch_compiler.BOUNDARY_MARKER
+    assert batch_compiler.split_pdf(blank_pdf(3), f"{marker}2\n", 2) is None
+    assert batch_compiler.split_pdf(blank_pdf(3), f"{marker}2\n{marker}2\n", 2) is None
+    assert batch_compiler.split_pdf(blank_pdf(3), f"{marker}1\n{marker}2\n", 2) is None
+
+
+@pytest.mark.skipif(shutil.which("pdflatex") is None, reason="pdflatex is not installed")
+def test_two_resume_batch_splits_into_one_pdf_per_resume():
+    output = latex_compiler.compile_latex(combined_batch("tech_resume"), keep_log=True)
+    assert output["success"]
+
+    pdfs = batch_compiler.split_pdf(output["pdf"], output["log"], len(RESUMES))
+
+    assert pdfs is not None and len(pdfs) == len(RESUMES)
+    for pdf, resume in zip(pdfs, RESUMES):
+        text = "".join(page.extract_text() for page in PdfReader(io.BytesIO(pdf)).pages)
+        assert resume["personal_info"]["name"] in text
@@ -0,0 +1,14 @@
+"""Tests for the compile job endpoint's request validation."""
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+DOCUMENT = "\\documentclass{article}\n\\begin{document}\nx\n\\end{document}\n"
+
+
+def test_compile_job_rejects_fit_pages():
+    response = TestClient(app).post("/compile-jobs", json={"latex_code": DOCUMENT, "fit_pages": 1})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "fit_pages"]
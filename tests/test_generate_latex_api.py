@@ -0,0 +1,34 @@
+"""Tests for /generate-latex error handling."""
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+RESUME = {
+    "personal_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "skills": ["Mathematics", "Analysis"],
+}
+MALFORMED = {**RESUME, "skills": [{"name": "Mathematics"}, 42]}
+
+
+def generate(resume_data, stream):
+    return TestClient(app, raise_server_exceptions=False).post("/generate-latex", json={
+        "resume_data": resume_data, "template": "tech_resume", "industry": "Technology", "stream": stream,
+    })
+
+
+def test_streamed_and_buffered_output_match():
+    streamed = generate(RESUME, stream=True)
+    buffered = generate(RESUME, stream=False)
+
+    assert streamed.status_code == 200
+    assert streamed.text == buffered.json()["latex_code"]
+
+
+def test_malformed_input_fails_with_500_when_streaming():
+    buffered = generate(MALFORMED, stream=False)
+    streamed = generate(MALFORMED, stream=True)
+
+    assert buffered.status_code == 500
+    assert streamed.status_code == 500
+    assert streamed.json()["detail"] == buffered.json()["detail"]
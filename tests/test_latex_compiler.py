@@ -0,0 +1,61 @@
+"""Tests for the pdflatex sandbox wrapper."""
+
+import os
+
+import pytest
+
+from backend import latex_compiler
+from backend.config import Config
+
+
+def test_missing_pdflatex_raises_file_not_found(monkeypatch, tmp_path):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.setattr(Config, "PDFLATEX_PATH", "")
+
+    with pytest.raises(FileNotFoundError):
+        latex_compiler.compile_latex("\\documentclass{article}\n\\begin{document}\nx\n\\end{document}\n")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="rlimits are only applied on POSIX")
+def test_governed_execs_the_command_under_limits(monkeypatch):
+    monkeypatch.setattr(Config, "LATEX_CPU_LIMIT", 30)
+    monkeypatch.setattr(Config, "LATEX_MEMORY_LIMIT_MB", 0)
+    monkeypatch.setattr(Config, "LATEX_MAX_OUTPUT_MB", 0)
+
+    command = latex_compiler.governed(["sh", "-c", "true"])
+
+    assert command[:2] == ["/bin/sh", "-c"]
+    assert "ulimit -S -t 30" in command[2] and command[2].endswith('exec "$@"')
+    assert command[-3:] == ["sh", "-c", "true"]
+
+
+def test_pdflatex_file_access_is_paranoid(tmp_path):
+    env = latex_compiler.process_options(str(tmp_path))["env"]
+
+    assert env["openin_any"] == "p"
+    assert env["openout_any"] == "p"
+    assert env["TEXMFOUTPUT"] == str(tmp_path)
+
+
+def test_format_failing_its_probe_is_never_published(monkeypatch, tmp_path):
+    preamble = "\\documentclass{article}\n"
+    unverified = tmp_path / "resume-unverified.fmt"
+
+    def dump_format(_preamble):
+        unverified.write_text("fmt")
+        return str(unverified)
+
+    def crashing_worker(_format_file):
+        raise OSError("probe crashed")
+
+    monkeypatch.setattr(Config, "ENABLE_LATEX_WARM_POOL", True)
+    monkeypatch.setattr(Config, "LATEX_FORMAT_DIR", str(tmp_path))
+    monkeypatch.setattr(latex_compiler, "dump_format", dump_format)
+    monkeypatch.setattr(latex_compiler, "WarmWorker", crashing_worker)
+    monkeypatch.setattr(latex_compiler, "_pools", {})
+
+    latex_compiler.warm_up([preamble])
+    latex_compiler.load_formats([preamble])
+
+    assert list(tmp_path.iterdir()) == []
+    assert latex_compiler._pools == {}
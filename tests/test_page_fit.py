@@ -0,0 +1,34 @@
+"""Tests for the page-fit layout variants."""
+
+from backend import page_fit
+from backend.template_manager import CLASSIC_ALTACV, MODERN_DEEDY_PREAMBLE
+
+
+def test_variant_names_match_their_settings():
+    assert all(page_fit.variant_name(variant) == variant["name"] for variant in page_fit.LAYOUT_VARIANTS)
+
+
+def test_unknown_document_gets_every_variant():
+    document = "\\documentclass{article}\n\\begin{document}\nx\n\\end{document}\n"
+
+    assert page_fit.variants_for(document) == page_fit.LAYOUT_VARIANTS
+
+
+def test_steps_never_loosen_margins_or_font_size():
+    for document in (CLASSIC_ALTACV, MODERN_DEEDY_PREAMBLE + "\\begin{document}\n"):
+        margin = page_fit.document_margin(document)
+        font = page_fit.document_font_size(document)
+        variants = page_fit.variants_for(document)
+
+        assert all(v["margin"] is None or v["margin"] < margin for v in variants)
+        assert all(v["font"] is None or v["font"] < font for v in variants)
+        settings = [(v["margin"], v["font"], v["spacing"]) for v in variants]
+        assert len(settings) == len(set(settings))
+
+
+def test_ten_point_template_skips_the_ten_point_steps():
+    names = [variant["name"] for variant in page_fit.variants_for(CLASSIC_ALTACV)]
+
+    assert page_fit.document_font_size(CLASSIC_ALTACV) == 10
+    assert names == ["original", "compact-spacing", "tight-spacing",
+                     "margins-0.4in-9pt-tight", "margins-0.3in-9pt-tight"]
@@ -1,6 +1,7 @@
 import streamlit as st
 import requests
 import base64
+import time
 
 st.set_page_config(
     page_title="AI Resume Booster - LaTeX Edition",
@@ -55,6 +56,53 @@ if "resume_data" not in st.session_state :
 if "uploaded_files" not in st.session_state :
     st.session_state.uploaded_files = {}
 
+
+
+def compile_pdf_job ( latex_code: str, max_wait: int = 120 ) :
+    """
+    Compile LaTeX through the asynchronous job API.
+
+    Submits a compile job and polls its status with short requests instead of
+    holding one long request open. Returns the PDF bytes or None on failure.
+    """
+    submit = requests.post(
+        "http://127.0.0.1:8000/compile-jobs",
+        json={"latex_code" : latex_code},
+        timeout=10
+    )
+    if submit.status_code != 202 :
+        return None
+
+    job_id = submit.json()["job_id"]
+    deadline = time.time() + max_wait
+
+    while time.time() < deadline :
+        job = requests.get( f"http://127.0.0.1:8000/compile-jobs/{job_id}", timeout=10 ).json()
+
+        if job["state"] == "done" :
+            pdf = requests.get( f"http://127.0.0.1:8000/compile-jobs/{job_id}/pdf", timeout=30 )
+            return pdf.content if pdf.status_code == 200 else None
+        if job["state"] == "failed" :
+            return None
+
+        time.sleep( 0.5 )
+
+    return None
+
+
+def fetch_preview ( latex_code: str ) :
+    """Fetch base64 PNG thumbnails of each page, or an empty list if unavailable."""
+    try :
+        response = requests.post(
+            "http://127.0.0.1:8000/compile-preview",
+            json={"latex_code" : latex_code},
+            timeout=30
+        )
+        return response.json().get( "pages", [] ) if response.status_code == 200 else []
+    except Exception :
+        return []
+
+
 # HEADER
 st.markdown( '<div class="main-header">AI Resume Booster - LaTeX Edition</div>', unsafe_allow_html=True )
 st.markdown( '<div class="sub-header">Create Professional LaTeX Resumes with Certificates & Portfolio Links</div>',
@@ -397,7 +445,11 @@ with tab5 :
         if st.button( "Generate LaTeX & PDF", type="primary", use_container_width=True ) :
             with st.spinner( "Generating resume..." ) :
                 try :
-                    # Generate LaTeX
+                    # Generate LaTeX (unchanged input answers 304 with the previous ETag)
+                    headers = {}
+                    if st.session_state.get( "latex_code" ) and st.session_state.get( "latex_etag" ) :
+                        headers["If-None-Match"] = st.session_state.latex_etag
+
                     response = requests.post(
                         "http://127.0.0.1:8000/generate-latex",
                         json={
@@ -405,21 +457,22 @@ with tab5 :
                             "template" : selected_template,
                             "industry" : industry
                         },
+                        headers=headers,
                         timeout=30
-                    ).json()
+                    )
 
-                    latex_code = response.get( "latex_code", "" )
-                    st.session_state.latex_code = latex_code
+                    if response.status_code == 304 :
+                        latex_code = st.session_state.latex_code
+                    else :
+                        latex_code = response.json().get( "latex_code", "" )
+                        st.session_state.latex_code = latex_code
+                        st.session_state.latex_etag = response.headers.get( "ETag" )
 
-                    # Try to compile PDF directly
+                    # Try to compile PDF through the job API
                     try :
-                        pdf_response = requests.post(
-                            "http://127.0.0.1:8000/compile-pdf",
-                            json={"latex_code" : latex_code},
-                            timeout=60
-                        )
+                        pdf_content = compile_pdf_job( latex_code )
 
-                        if pdf_response.status_code == 200 :
+                        if pdf_content :
                             st.success( "Resume generated successfully!" )
 
                             # Show download buttons
@@ -428,7 +481,7 @@ with tab5 :
                             with col_a :
                                 st.download_button(
                                     "Download PDF",
-                                    pdf_response.content,
+                                    pdf_content,
                                     file_name="resume.pdf",
                                     mime="application/pdf",
                                     use_container_width=True
@@ -442,6 +495,15 @@ with tab5 :
                                     mime="text/plain",
                                     use_container_width=True
                                 )
+
+                            # Inline preview (the PDF is cached, so this only renders thumbnails)
+                            preview_pages = fetch_preview( latex_code )
+                            if preview_pages :
+                                st.markdown( "#### Preview" )
+                                preview_cols = st.columns( min( len( preview_pages ), 3 ) )
+                                for i, page in enumerate( preview_pages ) :
+                                    with preview_cols[i % len( preview_cols )] :
+                                        st.image( base64.b64decode( page ), caption=f"Page {i + 1}" )
                         else :
                             st.warning( "PDF compilation not available. Generating using online compiler..." )
 
@@ -482,6 +544,37 @@ with tab5 :
                 except Exception as e :
                     st.error( f"Error: {str( e )}" )
 
+    # Compare all templates side by side
+    st.markdown( "---" )
+    st.markdown( "### Compare Templates" )
+    if st.button( "Preview All Templates", use_container_width=True ) :
+        with st.spinner( "Rendering all templates..." ) :
+            try :
+                gallery = requests.post(
+                    "http://127.0.0.1:8000/render-gallery",
+                    json={
+                        "resume_data" : st.session_state.resume_data,
+                        "industry" : industry
+                    },
+                    timeout=120
+                )
+                if gallery.status_code == 200 :
+                    items = gallery.json()["templates"]
+                    gallery_cols = st.columns( 3 )
+                    for i, item in enumerate( items ) :
+                        with gallery_cols[i % 3] :
+                            label = latex_templates.get( item["template"], item["template"] )
+                            if item["success"] and item.get( "thumbnail" ) :
+                                st.image( base64.b64decode( item["thumbnail"] ), caption=label )
+                            elif item["success"] :
+                                st.caption( f"{label}: compiled (no preview available)" )
+                            else :
+                                st.caption( f"{label}: {item['error']}" )
+                else :
+                    st.warning( "Template gallery is not available right now." )
+            except Exception as e :
+                st.error( f"Error: {str( e )}" )
+
     # Display LaTeX Code Preview
     if "latex_code" in st.session_state and st.session_state.latex_code :
         st.markdown( "---" )